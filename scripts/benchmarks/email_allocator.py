@@ -0,0 +1,100 @@
+"""
+Benchmark da geração de e-mails únicos de aluno (hubescolar_import/email_allocator.py).
+
+Compara a busca anterior, que normalizava o nome a cada chamada e testava nome.sobrenome1,
+nome.sobrenome2, ... desde o início a cada colisão, com o EmailAllocator (próximo sufixo
+por base e partes do nome em cache), sobre nomes sintéticos com nomes e sobrenomes comuns.
+Confere também que os dois geram exatamente os mesmos e-mails.
+
+Uso: python scripts/benchmarks/email_allocator.py [--names 100000] [--existing 20000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from hubescolar_import.email_allocator import EmailAllocator, normalize_text  # noqa: E402
+
+FIRST_NAMES = ['MARIA', 'ANA', 'JOÃO', 'JOSÉ', 'PEDRO', 'LUCAS', 'GABRIEL', 'JÚLIA', 'BEATRIZ', 'LARISSA',
+               'MATHEUS', 'GUILHERME', 'RAFAEL', 'FERNANDA', 'CAMILA', 'VITÓRIA', 'ENZO', 'SOFIA', 'ALICE',
+               'MIGUEL', 'DAVI', 'HELENA', 'LAURA', 'ISABELLA', 'ARTHUR', 'HEITOR', 'MANUELA', 'LÍVIA']
+MIDDLE_NAMES = ['', 'DE', 'DA', 'DOS', 'CLARA', 'EDUARDA', 'HENRIQUE', 'VITOR', 'LUIZA', 'ANTÔNIO']
+LAST_NAMES = ['SILVA', 'SANTOS', 'OLIVEIRA', 'SOUZA', 'RODRIGUES', 'FERREIRA', 'ALVES', 'PEREIRA', 'LIMA',
+              'GOMES', 'COSTA', 'RIBEIRO', 'MARTINS', 'CARVALHO', 'ARAÚJO', 'MELO', 'BARBOSA', 'ROCHA',
+              'DIAS', 'NASCIMENTO', 'ANDRADE', 'MOREIRA', 'NUNES', 'MARQUES', 'MACHADO', 'MENDES', 'FREITAS']
+
+
+def synthetic_names(count, seed=42):
+    rng = random.Random(seed)
+    return [' '.join(part for part in (rng.choice(FIRST_NAMES), rng.choice(MIDDLE_NAMES),
+                                       rng.choice(LAST_NAMES)) if part)
+            for _ in range(count)]
+
+
+def legacy_generate_email(name, existing_emails):
+    """Cópia da geração anterior (users-to-json.py): normaliza a cada chamada e testa os sufixos desde 1."""
+    name = name.strip().title()
+    name_parts = name.split()
+
+    if len(name_parts) < 2:
+        email_base = f"{normalize_text(name_parts[0])}"
+    else:
+        email_base = f"{normalize_text(name_parts[0])}.{normalize_text(name_parts[-1])}"
+
+    email = f"{email_base}@aluno.edu.es.gov.br"
+
+    if email in existing_emails:
+        counter = 1
+        while f"{email_base}{counter}@aluno.edu.es.gov.br" in existing_emails:
+            counter += 1
+        email = f"{email_base}{counter}@aluno.edu.es.gov.br"
+
+    return email
+
+
+def legacy(names, existing):
+    existing_emails = set(existing)
+    emails = []
+    for name in names:
+        email = legacy_generate_email(name, existing_emails)
+        existing_emails.add(email)
+        emails.append(email)
+    return emails
+
+
+def allocator(names, existing):
+    emails = EmailAllocator(existing)
+    return [emails.allocate(name) for name in names]
+
+
+def measure(label, func, names, existing):
+    start = time.perf_counter()
+    emails = func(names, existing)
+    elapsed = time.perf_counter() - start
+    per_second = len(names) / elapsed if elapsed else float('inf')
+    print(f"{label:<12} {elapsed:8.3f}s  {per_second:12,.0f} e-mails/s")
+    return emails
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--names', type=int, default=100_000, help="Alunos a gerar (padrão: 100000).")
+    parser.add_argument('--existing', type=int, default=0,
+                        help="E-mails já cadastrados, simulando o dump da tabela users (padrão: 0).")
+    args = parser.parse_args()
+
+    names = synthetic_names(args.names)
+    existing = legacy(synthetic_names(args.existing, seed=7), ()) if args.existing else []
+    bases = len({EmailAllocator().email_base(name) for name in names})
+    print(f"\n{len(names)} nomes, {bases} bases nome.sobrenome, {len(existing)} e-mails já cadastrados\n")
+
+    legacy_emails = measure('anterior', legacy, names, existing)
+    allocator_emails = measure('alocador', allocator, names, existing)
+    print(f"\nMesmos e-mails: {legacy_emails == allocator_emails}")
+
+
+if __name__ == '__main__':
+    main()
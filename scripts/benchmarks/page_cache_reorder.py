@@ -0,0 +1,71 @@
+"""
+Conferência do cache por página do Camelot (TableRowExtractor.extract_camelot_rows) com páginas em outra ordem.
+
+Monta dois PDFs com as primeiras páginas do relatório de exemplo: um na ordem original e outro
+com as mesmas páginas reordenadas (a segunda metade antes da primeira). Extrai o original para
+preencher um cache novo, extrai o reordenado com esse cache (todas as páginas vêm do cache) e
+de novo sem cache, e compara a página e a turma de cada tabela nas duas extrações.
+Sai com código 1 se forem diferentes.
+
+Uso: python scripts/benchmarks/page_cache_reorder.py [caminho_do_pdf] [--pages 6]
+"""
+import os
+import sys
+import argparse
+import tempfile
+import contextlib
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+DEFAULT_PDF = os.path.join(SCRIPTS_DIR, 'Alunos por turma - EEEFM JOAO CRISOSTOMO BELESA.pdf')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from hubescolar_import.pdf_extractor import TableRowExtractor  # noqa: E402
+
+
+def write_pages(pdf_path, page_numbers, output_path):
+    """Grava um PDF só com as páginas informadas (1-based), nessa ordem."""
+    import fitz  # PyMuPDF
+
+    with fitz.open(pdf_path) as source:
+        source.select([page_number - 1 for page_number in page_numbers])
+        source.save(output_path)
+
+
+def labels(pdf_path, use_cache):
+    """(página, turma) de cada tabela extraída com o Camelot."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        tables, _ = TableRowExtractor(use_cache=use_cache, engine='camelot').extract_table_rows(pdf_path)
+    return [(table['page'], table.get('turma')) for table in tables]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pdf', nargs='?', default=DEFAULT_PDF)
+    parser.add_argument('--pages', type=int, default=6, help="Páginas do relatório usadas na conferência (padrão: 6).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # Cache vazio, só desta conferência
+        os.environ['EXTRACTION_CACHE_DIR'] = os.path.join(workdir, 'cache')
+        half = args.pages // 2
+        original = os.path.join(workdir, 'original.pdf')
+        reordered = os.path.join(workdir, 'reordenado.pdf')
+        write_pages(args.pdf, range(1, args.pages + 1), original)
+        write_pages(args.pdf, list(range(half + 1, args.pages + 1)) + list(range(1, half + 1)), reordered)
+
+        labels(original, use_cache=True)
+        from_cache = labels(reordered, use_cache=True)
+        fresh = labels(reordered, use_cache=False)
+
+    print(f"\n{args.pages} páginas, {len(fresh)} tabelas (páginas {half + 1}-{args.pages} antes de 1-{half})\n")
+    print(f"{'cache':<32} {'sem cache':<32}")
+    for cached_label, fresh_label in zip(from_cache, fresh):
+        mark = '' if cached_label == fresh_label else '  <- diferente'
+        print(f"{str(cached_label):<32} {str(fresh_label):<32}{mark}")
+    same = from_cache == fresh
+    print(f"\nMesmas páginas e turmas: {same}")
+    return 0 if same else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
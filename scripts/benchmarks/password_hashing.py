@@ -0,0 +1,47 @@
+"""
+Benchmark do hash das senhas iniciais dos alunos (hubescolar_import/password_hash.py).
+
+Gera senhas no formato do esquema 'nascimento' (DDMMAAAA) e mede a vazão do bcrypt (hashes/s)
+para cada custo e número de processos informados. Confere também que os hashes gerados
+validam as senhas de origem.
+
+Uso: python scripts/benchmarks/password_hashing.py [--passwords 200] [--rounds 10] [--jobs 1,2,4]
+"""
+import os
+import sys
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from hubescolar_import.password_hash import BCRYPT_ROUNDS, hash_passwords  # noqa: E402
+
+
+def synthetic_passwords(count, seed=42):
+    rng = random.Random(seed)
+    return [f"{rng.randrange(1, 29):02d}{rng.randrange(1, 13):02d}{rng.randrange(2005, 2015)}" for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--passwords', type=int, default=200, help="Senhas a gerar (padrão: 200).")
+    parser.add_argument('--rounds', default=str(BCRYPT_ROUNDS),
+                        help=f"Custos do bcrypt separados por vírgula (padrão: {BCRYPT_ROUNDS}).")
+    parser.add_argument('--jobs', default=','.join(sorted({'1', str(os.cpu_count() or 1)}, key=int)),
+                        help="Números de processos separados por vírgula (padrão: 1 e o número de CPUs).")
+    args = parser.parse_args()
+
+    import bcrypt
+
+    passwords = synthetic_passwords(args.passwords)
+    print(f"\n{len(passwords)} senhas, {os.cpu_count()} CPUs\n")
+    for rounds in [int(value) for value in args.rounds.split(',')]:
+        for jobs in [int(value) for value in args.jobs.split(',')]:
+            hashes = hash_passwords(passwords, jobs, rounds)
+            checked = all(bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('ascii'))
+                          for password, password_hash in list(zip(passwords, hashes))[:5])
+            print(f"  hashes conferem: {checked}")
+
+
+if __name__ == '__main__':
+    main()
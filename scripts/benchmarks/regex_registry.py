@@ -0,0 +1,116 @@
+"""
+Micro-benchmark dos padrões de regex compartilhados (hubescolar_import/parsing.py).
+
+Compara as buscas anteriores, com o padrão passado como string a cada chamada
+(re.findall/re.search/re.finditer) e as três buscas de turma feitas uma após a outra,
+com os padrões pré-compilados do registro, sobre o texto das páginas e as células das
+tabelas do PDF de exemplo. Mede também a alternação única das duas formas de turma,
+que o registro deixou de usar por ser mais lenta que as duas passadas separadas.
+
+Uso: python scripts/benchmarks/regex_registry.py [caminho_do_pdf] [--repeat N]
+"""
+import os
+import re
+import sys
+import time
+import argparse
+import contextlib
+
+import fitz
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+DEFAULT_PDF = os.path.join(SCRIPTS_DIR, 'Alunos por turma - EEEFM JOAO CRISOSTOMO BELESA.pdf')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from hubescolar_import.parsing import TURMA_CODE, find_date, find_phones, find_turmas  # noqa: E402
+from hubescolar_import.pdf_extractor import TableRowExtractor  # noqa: E402
+
+LEGACY_TURMA_PATTERNS = [
+    r"Turma:\s*(\d+[ªº][A-Z]{2}\d{2}-[A-Z]+)",
+    r"Turma:\s*([^\s\n,;]+(?:-[A-Z]+)?)",
+    r"(?<!\w)(\d+[ªº][A-Z]{2}\d{2}-[A-Z]+)(?!\w)"
+]
+
+# Alternação única do rótulo e do código, usada antes de parsing.TURMA_LABEL_RE/TURMA_CODE_RE
+COMBINED_TURMA_RE = re.compile(
+    r'(?i:Turma):[^\S\n]*(?P<rotulada>[^\n]*[^\s])'
+    r'|(?<!\w)(?P<codigo>' + TURMA_CODE + r')(?!\w)'
+)
+
+
+def legacy_turmas(texts):
+    """Cópia da busca anterior do pdf-to-csv-simples: três padrões, três passadas por página."""
+    found = 0
+    for text in texts:
+        for pattern in LEGACY_TURMA_PATTERNS:
+            for match in re.finditer(pattern, text, re.IGNORECASE):
+                match.group(1).strip()
+                found += 1
+    return found
+
+
+def combined_turmas(texts):
+    """Alternação única do rótulo e do código, uma passada por página."""
+    return sum(1 for text in texts for _ in COMBINED_TURMA_RE.finditer(text))
+
+
+def registry_turmas(texts):
+    """Rótulo e código pré-compilados em parsing.py, duas passadas por página."""
+    return sum(len(find_turmas(text)) for text in texts)
+
+
+def legacy_cells(cells):
+    """Telefones e datas com o padrão em string a cada chamada, como nos scripts anteriores."""
+    found = 0
+    for cell in cells:
+        found += len(re.findall(r'\((\d{2})\)\s*(\d{4,5})-(\d{4})', cell))
+        if re.search(r'(\d{2})/(\d{2})/(\d{4})', cell):
+            found += 1
+    return found
+
+
+def registry_cells(cells):
+    """Telefones e datas com os padrões pré-compilados de hubescolar_import/parsing.py."""
+    found = 0
+    for cell in cells:
+        found += len(find_phones(cell))
+        if find_date(cell):
+            found += 1
+    return found
+
+
+def measure(label, func, repeat, total_items, unit):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        found = func()
+    elapsed = time.perf_counter() - start
+    per_second = total_items * repeat / elapsed if elapsed else float('inf')
+    print(f"{label:<20} {elapsed:8.3f}s  {per_second:12,.0f} {unit}/s  ({found} ocorrências)")
+
+
+def load_cells(pdf_path):
+    """Todas as células de texto das tabelas do PDF (usa o cache de extração)."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        tables, _ = TableRowExtractor().extract_table_rows(pdf_path)
+    return [cell for table in tables for row in table['rows'] for cell in row if isinstance(cell, str)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pdf', nargs='?', default=DEFAULT_PDF)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    with fitz.open(args.pdf) as doc:
+        texts = [page.get_text() for page in doc]
+    cells = load_cells(args.pdf)
+    print(f"\n{len(texts)} páginas, {len(cells)} células, {args.repeat} repetições\n")
+
+    measure('turmas anterior', lambda: legacy_turmas(texts), args.repeat, len(texts), 'páginas')
+    measure('turmas alternação', lambda: combined_turmas(texts), args.repeat, len(texts), 'páginas')
+    measure('turmas registro', lambda: registry_turmas(texts), args.repeat, len(texts), 'páginas')
+    measure('células anterior', lambda: legacy_cells(cells), args.repeat, len(cells), 'células')
+    measure('células registro', lambda: registry_cells(cells), args.repeat, len(cells), 'células')
+
+if __name__ == '__main__':
+    main()
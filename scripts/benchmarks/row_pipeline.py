@@ -0,0 +1,115 @@
+"""
+Benchmark da etapa linhas→turmas (hubescolar_import.student_parser).
+
+Compara a implementação anterior (todas as linhas copiadas para `all_table_rows`
+com df.iloc e percorridas por índice) com o pipeline de geradores célula a célula,
+medindo linhas por segundo e pico de memória (tracemalloc) sobre o PDF de exemplo.
+
+Uso: python scripts/benchmarks/row_pipeline.py [caminho_do_pdf] [--repeat N]
+"""
+import os
+import re
+import sys
+import time
+import argparse
+import contextlib
+import tracemalloc
+
+import pandas as pd
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+DEFAULT_PDF = os.path.join(SCRIPTS_DIR, 'Alunos por turma - EEEFM JOAO CRISOSTOMO BELESA.pdf')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from hubescolar_import.pdf_extractor import TableRowExtractor  # noqa: E402
+from hubescolar_import.student_parser import StudentParser  # noqa: E402
+
+
+def legacy_reconstruct(clean, rows, start_idx):
+    """Cópia da reconstrução anterior, que reavalia clean_cell_text e re.match a cada acesso."""
+    name_parts = []
+    current_idx = start_idx
+    first_row = rows[current_idx]
+    match = re.match(r"^(\d+)\s*(.*)", clean(first_row[0]))
+    if match:
+        name_parts.append(match.group(2).strip())
+    if len(first_row) > 1 and clean(first_row[1]):
+        name_parts.append(clean(first_row[1]))
+    if len(first_row) > 5:
+        clean(first_row[5])
+    rows_used = 1
+    while (current_idx + 1 < len(rows) and
+           not re.match(r"^\d+", clean(rows[current_idx + 1][0]))):
+        current_idx += 1
+        rows_used += 1
+        additional_row = rows[current_idx]
+        if len(additional_row) > 0 and clean(additional_row[0]):
+            if not re.match(r"^\d+", clean(additional_row[0])):
+                name_parts.append(clean(additional_row[0]))
+        if len(additional_row) > 1 and clean(additional_row[1]):
+            name_parts.append(clean(additional_row[1]))
+    return ' '.join(filter(None, name_parts)), rows_used
+
+
+def legacy_pipeline(clean, dataframes):
+    """Cópia do laço anterior de process_pdf: materializa todas as linhas e anda por índice."""
+    all_table_rows = []
+    for df in dataframes:
+        for r_idx in range(df.shape[0]):
+            all_table_rows.append(df.iloc[r_idx].tolist())
+
+    records = 0
+    r_idx = 0
+    while r_idx < len(all_table_rows):
+        first_col_content = clean(all_table_rows[r_idx][0])
+        if first_col_content and re.match(r"^\d+", first_col_content):
+            _, rows_used = legacy_reconstruct(clean, all_table_rows, r_idx)
+            records += 1
+            r_idx += rows_used
+        else:
+            r_idx += 1
+    return records
+
+
+def generator_pipeline(processor, tables):
+    """Pipeline atual: tabelas -> linhas -> células limpas -> registros."""
+    records = 0
+    cleaned_rows = processor.iter_cleaned_rows(processor.iter_table_rows(tables))
+    for record_rows, columns, _ in processor.iter_record_rows(cleaned_rows):
+        processor.reconstruct_student_data(record_rows, columns)
+        records += 1
+    return records
+
+
+def measure(label, func, repeat, total_rows):
+    tracemalloc.start()
+    start = time.perf_counter()
+    # As mensagens de linhas ignoradas não entram na medição
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            records = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rows_per_second = total_rows * repeat / elapsed if elapsed else float('inf')
+    print(f"{label:<12} {elapsed:8.3f}s  {rows_per_second:12,.0f} linhas/s  pico {peak / 1024:10,.1f} KiB  ({records} registros)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pdf', nargs='?', default=DEFAULT_PDF)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    processor = StudentParser()
+    tables, _ = TableRowExtractor().extract_table_rows(args.pdf)
+    dataframes = [pd.DataFrame(table['rows']) for table in tables]
+    total_rows = sum(len(table['rows']) for table in tables)
+    print(f"\n{len(tables)} tabelas, {total_rows} linhas, {args.repeat} repetições\n")
+
+    clean = processor.text_cleaner.clean_cell_text
+    measure('anterior', lambda: legacy_pipeline(clean, dataframes), args.repeat, total_rows)
+    measure('geradores', lambda: generator_pipeline(processor, tables), args.repeat, total_rows)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark da montagem do JSON de turmas a partir dos alunos reconstruídos (hubescolar_import/models.py).
+
+Compara o caminho anterior, que criava um Student do Pydantic por aluno e depois montava o PDFData
+e chamava model_dump, com os StudentRecord (NamedTuple) validados de uma vez pelo TypeAdapter
+(validate_turmas) e com a saída sem validação (--no-validate). Confere também que os três geram o mesmo JSON.
+
+Uso: python scripts/benchmarks/student_records.py [--students 100000] [--turmas 40]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from hubescolar_import.models import Metadata, PDFData, Student, StudentRecord, validate_turmas  # noqa: E402
+
+METADATA = {'data_emissao': 'Sex, 16 de Maio de 2025, 14:02', 'escola': 'EEEFM EXEMPLO', 'arquivo_origem': 'exemplo.pdf'}
+
+
+def synthetic_records(students, turmas, seed=42):
+    """(turma, StudentRecord) em ordem de turma, com 0 a 3 telefones por aluno."""
+    rng = random.Random(seed)
+    records = []
+    for index in range(students):
+        phones = [f"(27)9{rng.randrange(10**7, 10**8)}" for _ in range(rng.randrange(4))]
+        records.append((f"{index * turmas // students + 1}ªM01-EM", StudentRecord(
+            nome=f"ALUNO {index}", dt_nascimento=f"{rng.randrange(1, 29):02d}/{rng.randrange(1, 13):02d}/2010",
+            sexo=rng.choice(['masculino', 'feminino']), idade=rng.randrange(10, 19),
+            telefone=phones[0] if phones else None, telefones=phones)))
+    return records
+
+
+def legacy(records):
+    """Cópia do caminho anterior: um Student validado por aluno, PDFData e model_dump."""
+    turmas = {}
+    for turma, record in records:
+        turmas.setdefault(turma, []).append(Student(
+            nome=record.nome, dt_nascimento=record.dt_nascimento, sexo=record.sexo,
+            idade=record.idade, telefone=record.telefone, telefones=record.telefones))
+    return PDFData(metadados=Metadata(**METADATA), turmas=turmas).model_dump(by_alias=True)
+
+
+def batch(records, validate=True):
+    turmas = {}
+    for turma, record in records:
+        turmas.setdefault(turma, []).append(record)
+    return {'metadados': Metadata(**METADATA).model_dump(by_alias=True), 'turmas': validate_turmas(turmas, validate)}
+
+
+def measure(label, func, records):
+    start = time.perf_counter()
+    result = func(records)
+    elapsed = time.perf_counter() - start
+    per_second = len(records) / elapsed if elapsed else float('inf')
+    print(f"{label:<16} {elapsed:8.3f}s  {per_second:12,.0f} alunos/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--students', type=int, default=100_000, help="Alunos a gerar (padrão: 100000).")
+    parser.add_argument('--turmas', type=int, default=40, help="Turmas entre as quais os alunos são divididos (padrão: 40).")
+    args = parser.parse_args()
+
+    records = synthetic_records(args.students, args.turmas)
+    print(f"\n{len(records)} alunos em {args.turmas} turmas\n")
+
+    legacy_json = measure('Student por aluno', legacy, records)
+    batch_json = measure('TypeAdapter', batch, records)
+    trusted_json = measure('sem validação', lambda records: batch(records, validate=False), records)
+    print(f"\nMesmo JSON: {legacy_json == batch_json == trusted_json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark dos backends de texto (hubescolar_import/pdf_document.py, TEXT_BACKENDS).
+
+Mede, para cada backend, o texto do PDF inteiro (como a antiga extract_text_from_pdf fazia só para
+achar a escola e a turma) e a leitura dos metadados como é feita agora: nome da escola pela
+primeira página e a primeira turma lendo as páginas só até encontrá-la. Cada medição abre o PDF
+de novo, para que o texto guardado no PDFDocument não seja reaproveitado entre elas.
+
+Uso: python scripts/benchmarks/text_backends.py [caminho_do_pdf]
+"""
+import os
+import sys
+import time
+import argparse
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+DEFAULT_PDF = os.path.join(SCRIPTS_DIR, 'Alunos por turma - EEEFM JOAO CRISOSTOMO BELESA.pdf')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from hubescolar_import.pdf_document import TEXT_BACKENDS, PDFDocument  # noqa: E402
+from hubescolar_import.pdf_extractor import PDFExtractor  # noqa: E402
+
+
+def full_text(pdf_path, backend):
+    extractor = PDFExtractor(backend)
+    with PDFDocument(pdf_path) as document:
+        text = extractor.extract_text_from_pdf(document)
+    return extractor.get_school_name_from_header(text), extractor.get_turma_from_text(text)
+
+
+def header_only(pdf_path, backend):
+    extractor = PDFExtractor(backend)
+    with PDFDocument(pdf_path) as document:
+        return extractor.read_school_name(document), extractor.read_turma_name(document)
+
+
+def measure(label, func, pdf_path, backend):
+    start = time.perf_counter()
+    result = func(pdf_path, backend)
+    elapsed = time.perf_counter() - start
+    print(f"{backend:<8} {label:<14} {elapsed:8.3f}s  {result[0]} / {result[1]}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pdf', nargs='?', default=DEFAULT_PDF)
+    args = parser.parse_args()
+
+    with PDFDocument(args.pdf) as document:
+        print(f"\n{os.path.basename(args.pdf)}: {document.page_count} páginas\n")
+
+    results = set()
+    for backend in TEXT_BACKENDS:
+        results.add(measure('texto inteiro', full_text, args.pdf, backend))
+        results.add(measure('cabeçalho', header_only, args.pdf, backend))
+    print(f"\nMesmos metadados: {len(results) == 1}")
+
+
+if __name__ == '__main__':
+    main()
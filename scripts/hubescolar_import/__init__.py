@@ -0,0 +1,11 @@
+"""
+Importação do PDF "Alunos por turma" do SEGES para o HubEscolar.
+
+As etapas (pdf→linhas, linhas→turmas, turmas→usuários) podem ser usadas separadamente
+ou encadeadas em memória pela CLI `hubescolar-import` (ver cli.py).
+"""
+from .pipeline import load_rows, load_turmas, pdf_to_rows, rows_to_turmas, turmas_to_users
+
+__version__ = "0.1.0"
+
+__all__ = ['load_rows', 'load_turmas', 'pdf_to_rows', 'rows_to_turmas', 'turmas_to_users']
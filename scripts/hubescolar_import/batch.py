@@ -0,0 +1,114 @@
+import glob
+import os
+import sys
+import time
+
+# Execução de uma mesma etapa sobre vários arquivos (ex: todos os PDFs de um distrito).
+
+
+def expand_inputs(inputs, extensions=('.pdf',)):
+    """
+    Aceita arquivos, pastas e padrões glob ('dados/*.pdf') e retorna os arquivos encontrados,
+    em ordem e sem repetição. De uma pasta são usados os arquivos com uma das extensões.
+    """
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = [os.path.join(item, name) for name in sorted(os.listdir(item))
+                       if name.lower().endswith(extensions)]
+        elif glob.has_magic(item):
+            matches = sorted(glob.glob(item))
+        else:
+            matches = [item]
+        paths.extend(match for match in matches if os.path.isfile(match) and match not in paths)
+    return paths
+
+
+def _timed(task, path):
+    """
+    Executa a tarefa de um arquivo e devolve o resultado com o tempo gasto e o erro, se houver.
+    Fica no nível do módulo para poder ser enviada aos processos do ProcessPoolExecutor.
+    """
+    start = time.perf_counter()
+    result = {'arquivo': path, 'erro': None}
+    try:
+        result.update(task(path) or {})
+    except Exception as e:
+        result['erro'] = str(e)
+    result['segundos'] = time.perf_counter() - start
+    return result
+
+
+def run_batch(paths, task, jobs=1, initializer=None):
+    """
+    Executa task(caminho) -> dict para cada arquivo e retorna os resultados na ordem dos arquivos.
+    Com jobs <= 1 tudo roda neste processo, em sequência; caso contrário, num pool de `jobs` processos
+    que vivem até o fim do lote (o estado carregado por um processo, como a JVM do tabula,
+    é reaproveitado por todos os arquivos que ele recebe).
+    Uma falha em um arquivo é registrada no resultado dele e não interrompe os demais.
+    """
+    if jobs <= 1 or len(paths) <= 1:
+        if initializer:
+            initializer()
+        results = []
+        for path in paths:
+            results.append(_timed(task, path))
+            print_file_result(results[-1])
+        return results
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer) as executor:
+        futures = {executor.submit(_timed, task, path): path for path in paths}
+        for future in as_completed(futures):
+            result = future.result()
+            results[result['arquivo']] = result
+            print_file_result(result)
+    return [results[path] for path in paths]
+
+
+def print_file_result(result):
+    status = f"ERRO: {result['erro']}" if result['erro'] else f"{result.get('alunos', 0)} alunos"
+    print(f"[{result['segundos']:7.2f}s] {os.path.basename(result['arquivo'])}: {status}", file=sys.stderr)
+
+
+def print_batch_report(results, elapsed, output=sys.stderr, duplicates=None):
+    """
+    Escreve o tempo de cada arquivo (com as contagens do delta, quando houver), o total do lote,
+    a vazão (arquivos/s, páginas/s, alunos/s, pelo tempo total do lote), os alunos repetidos entre
+    turmas e escolas (contagens de pipeline.finish_school_files, quando houver) e a lista de falhas.
+    """
+    failures = [result for result in results if result['erro']]
+    students = sum(result.get('alunos', 0) for result in results)
+    pages = sum(result.get('paginas', 0) for result in results)
+    print("\n--- Resumo do lote ---", file=output)
+    for result in results:
+        if result['erro']:
+            status = "ERRO"
+        else:
+            status = f"{result.get('alunos', 0):6d} alunos"
+            if result.get('paginas'):
+                status += f" {result['paginas']:5d} páginas"
+        changes = ""
+        if result.get('delta'):
+            delta = result['delta']
+            changes = (f"  (delta: +{delta['adicionados']} -{delta['removidos']}, {delta['mudaram_turma']} mudaram de turma, "
+                       f"{delta['telefones_alterados']} com telefones alterados)")
+        print(f"{result['segundos']:8.2f}s  {status}  {os.path.basename(result['arquivo'])}{changes}", file=output)
+
+    def rate(amount):
+        return amount / elapsed if elapsed else 0
+
+    print(f"Total: {len(results)} arquivos ({len(failures)} com erro), {pages} páginas, {students} alunos "
+          f"em {elapsed:.2f}s", file=output)
+    print(f"Vazão: {rate(len(results)):.2f} arquivos/s, {rate(pages):.1f} páginas/s, {rate(students):.1f} alunos/s",
+          file=output)
+    if duplicates:
+        print(f"Duplicados: {duplicates['alunos']} alunos em mais de um registro ({duplicates['transferencias']} entre escolas, "
+              f"{duplicates['mesma_escola']} na mesma escola); política {duplicates['politica']}, "
+              f"{duplicates['registros_removidos']} registros removidos. Relatório: {duplicates['saida']}", file=output)
+    if failures:
+        print("Falhas:", file=output)
+        for result in failures:
+            print(f"  {os.path.basename(result['arquivo'])}: {result['erro']}", file=output)
@@ -0,0 +1,84 @@
+import csv
+import json
+import os
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+from .password_hash import BCRYPT_ROUNDS, hash_passwords
+
+# Exportação dos alunos gerados (build_users) para carga em lote na tabela users do users-service:
+# arquivos CSV ou NDJSON de até `chunk_size` usuários, com as colunas na ordem da tabela e as senhas
+# já com hash. Cada arquivo vira um único comando no banco, em vez de um cadastro por aluno:
+#   CSV     LOAD DATA LOCAL INFILE '<arquivo>' INTO TABLE users FIELDS TERMINATED BY ','
+#           OPTIONALLY ENCLOSED BY '"' IGNORE 1 LINES (<colunas da primeira linha>)
+#   NDJSON  User.bulkCreate(linhas) (sem individualHooks, para o hook beforeCreate não refazer o hash)
+
+# Colunas da tabela users na ordem das migrations (create-users e add-grade-id-to-users),
+# sem o id (auto incremento)
+USERS_COLUMNS = (
+    'name', 'email', 'password', 'cpf', 'phone', 'dateOfBirth', 'gender', 'profilePic', 'role', 'horario',
+    'userClass', 'content', 'schoolId', 'districtId', 'address', 'city', 'state', 'zip', 'status',
+    'createdAt', 'updatedAt', 'gradeId',
+)
+
+BULK_FORMATS = ('csv', 'ndjson')
+
+# Usuários por arquivo (e por comando de carga)
+DEFAULT_CHUNK_SIZE = 500
+
+# NULL no LOAD DATA do MySQL
+MYSQL_NULL = '\\N'
+
+
+def bulk_rows(users: List[dict], password_hashes: List[str], created_at: str) -> Iterator[tuple]:
+    """
+    Linhas da tabela users (valores na ordem de USERS_COLUMNS), com o hash no lugar da senha
+    e a data de criação da exportação em createdAt/updatedAt.
+    Campos do usuário que não são colunas da tabela (ex: idInep) ficam de fora.
+    """
+    for user, password_hash in zip(users, password_hashes):
+        row = dict(user, password=password_hash, createdAt=created_at, updatedAt=created_at)
+        yield tuple(row.get(column) for column in USERS_COLUMNS)
+
+
+def chunk_path(output_path: str, index: int, fmt: str) -> str:
+    """
+    Arquivo do lote `index` (1-based): 'alunos.json' -> 'alunos.0001.csv'.
+    """
+    return f"{os.path.splitext(output_path)[0]}.{index:04d}.{fmt}"
+
+
+def write_chunk(rows: List[tuple], path: str, fmt: str) -> None:
+    with open(path, 'w', encoding='utf-8', newline='') as output:
+        if fmt == 'csv':
+            writer = csv.writer(output)
+            writer.writerow(USERS_COLUMNS)
+            writer.writerows([MYSQL_NULL if value is None else value for value in row] for row in rows)
+        else:
+            for row in rows:
+                output.write(json.dumps(dict(zip(USERS_COLUMNS, row)), ensure_ascii=False) + '\n')
+
+
+def write_bulk_files(users: List[dict], output_path: str, fmt: str = 'csv', chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     hash_jobs: Optional[int] = None, rounds: int = BCRYPT_ROUNDS) -> List[str]:
+    """
+    Grava os usuários em arquivos de até chunk_size linhas ao lado de output_path (ver chunk_path),
+    criando a pasta de output_path antes do hash, que é a parte demorada. As senhas de todos os usuários passam pelo bcrypt (custo `rounds`) antes, num pool de hash_jobs
+    processos (ver password_hash.hash_passwords). Retorna os caminhos gravados, na ordem dos usuários.
+    """
+    if fmt not in BULK_FORMATS:
+        raise ValueError(f"Formato de carga em lote desconhecido: {fmt}")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    password_hashes = hash_passwords([user['password'] for user in users], hash_jobs, rounds)
+    created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    rows = list(bulk_rows(users, password_hashes, created_at))
+
+    chunk_size = max(1, chunk_size)
+    paths = []
+    for start in range(0, len(rows), chunk_size):
+        path = chunk_path(output_path, len(paths) + 1, fmt)
+        write_chunk(rows[start:start + chunk_size], path, fmt)
+        paths.append(path)
+    print(f"{len(rows)} usuários gravados para carga em lote em {len(paths)} arquivo(s): "
+          f"{chunk_path(output_path, 1, fmt).replace('.0001.', '.*.')}")
+    return paths
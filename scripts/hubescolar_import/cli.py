@@ -0,0 +1,315 @@
+import argparse
+import contextlib
+import functools
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+from .batch import expand_inputs, print_batch_report, run_batch
+from .bulk_export import BULK_FORMATS, DEFAULT_CHUNK_SIZE
+from .duplicate_index import DEDUPE_POLICIES, DEFAULT_DEDUPE_POLICY
+from .password_hash import BCRYPT_ROUNDS, MAX_BCRYPT_ROUNDS, MIN_BCRYPT_ROUNDS
+from .pdf_document import DEFAULT_TEXT_BACKEND, TEXT_BACKENDS
+from .pdf_extractor import ENGINES, start_tabula_session
+from .pipeline import (convert_school_file, convert_users_file, default_output_path, finish_school_files,
+                       flatten_turmas, load_rows, load_turmas, rows_to_turmas, save_users, school_slug,
+                       turmas_to_users)
+from .startup_profile import ImportProfiler
+from .turma_index import TurmaIndex
+from .user_builder import DEFAULT_PASSWORD_SCHEME, PASSWORD_SCHEMES
+
+# ID da escola e do distrito usados quando não são informados
+DEFAULT_SCHOOL_ID = 3
+DEFAULT_DISTRICT_ID = 1
+
+# Pasta lida pelo syncService.fetchSegesData, quando a CLI roda a partir do repositório
+SYNC_DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'sync-service', 'data'))
+
+
+def bcrypt_rounds(value):
+    """
+    Custo do bcrypt informado na linha de comando, conferido antes de qualquer extração.
+    """
+    rounds = int(value)
+    if not MIN_BCRYPT_ROUNDS <= rounds <= MAX_BCRYPT_ROUNDS:
+        raise argparse.ArgumentTypeError(f"o custo do bcrypt deve estar entre {MIN_BCRYPT_ROUNDS} e {MAX_BCRYPT_ROUNDS}")
+    return rounds
+
+
+def build_parser():
+    # Opções de extração comuns a todas as etapas que podem precisar ler o PDF
+    extraction = argparse.ArgumentParser(add_help=False)
+    extraction.add_argument('--workers', type=int, default=1,
+                            help="Número de processos para extrair as tabelas em paralelo, por intervalos de páginas (padrão: 1).")
+    extraction.add_argument('--no-cache', action='store_true',
+                            help="Ignora o cache de extração e sempre roda o extrator de tabelas.")
+    extraction.add_argument('--engine', choices=ENGINES, default='text',
+                            help="Extrator de tabelas (padrão: text, que lê a camada de texto do PDF e usa o Camelot só nas "
+                                 "páginas que não conseguir ler; tabula requer Java).")
+    extraction.add_argument('--text-backend', choices=sorted(TEXT_BACKENDS), default=DEFAULT_TEXT_BACKEND,
+                            help=f"Leitor do texto das páginas, usado nos metadados do PDF (padrão: {DEFAULT_TEXT_BACKEND}).")
+    extraction.add_argument('--no-validate', action='store_true',
+                            help="Não valida os alunos com o Pydantic na saída (fontes confiáveis).")
+
+    users = argparse.ArgumentParser(add_help=False)
+    users.add_argument('--school-id', type=int, default=DEFAULT_SCHOOL_ID,
+                       help=f"schoolId dos alunos gerados (padrão: {DEFAULT_SCHOOL_ID}).")
+    users.add_argument('--district-id', type=int, default=DEFAULT_DISTRICT_ID,
+                       help=f"districtId dos alunos gerados (padrão: {DEFAULT_DISTRICT_ID}).")
+    users.add_argument('--existing-emails', metavar='DUMP',
+                       help="Dump da tabela users do users-service (SQL, CSV ou JSON). "
+                            "Os e-mails de aluno encontrados nele não são gerados de novo.")
+    users.add_argument('--password-scheme', choices=PASSWORD_SCHEMES, default=DEFAULT_PASSWORD_SCHEME,
+                       help="Senha inicial dos alunos: a mesma para todos (padrao) ou a data de nascimento "
+                            "de cada um, DDMMAAAA (nascimento).")
+    users.add_argument('--hash-passwords', action='store_true',
+                       help="Grava o JSON com as senhas já com hash bcrypt, para uma importação que não passe pelo "
+                            "hook beforeCreate do users-service (com --bulk o hash é sempre feito).")
+    users.add_argument('--bcrypt-rounds', type=bcrypt_rounds, default=BCRYPT_ROUNDS,
+                       help=f"Custo do bcrypt (padrão: {BCRYPT_ROUNDS}, o do users-service).")
+    users.add_argument('--bulk', choices=BULK_FORMATS,
+                       help="Em vez do JSON, grava arquivos de carga em lote (<saida>.0001.csv, ...) com as colunas na "
+                            "ordem da tabela users e as senhas já com hash bcrypt (requer o pacote bcrypt).")
+    users.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                       help=f"Usuários por arquivo de carga em lote (padrão: {DEFAULT_CHUNK_SIZE}).")
+    users.add_argument('--hash-jobs', type=int,
+                       help="Processos que calculam os hashes das senhas (padrão: número de CPUs, "
+                            "divididos entre os arquivos de um lote).")
+
+    parser = argparse.ArgumentParser(
+        prog='hubescolar-import',
+        description="Importa o PDF 'Alunos por turma' do SEGES: pdf → linhas → turmas → usuários.")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="Mostra em stderr o tempo de cada import feito durante o comando e o tempo total.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    pdf_rows = subparsers.add_parser('pdf-rows', parents=[extraction],
+                                     help="Extrai as linhas brutas das tabelas do PDF.")
+    pdf_rows.add_argument('input', help="PDF do SEGES.")
+    pdf_rows.add_argument('-o', '--output',
+                          help="Arquivo de saída ('-' para stdout). Padrão: <entrada>.rows.json.")
+
+    rows_turmas = subparsers.add_parser('rows-turmas', parents=[extraction],
+                                        help="Reconstrói os alunos de cada turma.")
+    rows_turmas.add_argument('input', help="Arquivo de linhas (pdf-rows), PDF ou CSV da extração simples.")
+    rows_turmas.add_argument('-o', '--output',
+                             help="Arquivo de saída ('-' para stdout). Padrão: <entrada>.json (ou .ndjson).")
+    rows_turmas.add_argument('--ndjson', action='store_true',
+                             help="Escreve um aluno por linha (NDJSON) à medida que são processados, sem montar o JSON completo.")
+    rows_turmas.add_argument('--flat', action='store_true',
+                             help="Grava as turmas no nível raiz do JSON, no formato lido pelo sync-service.")
+
+    turmas_users = subparsers.add_parser('turmas-users', parents=[extraction, users],
+                                         help="Gera os usuários (alunos) no formato do users-service.")
+    turmas_users.add_argument('input', nargs='+',
+                              help="JSON de turmas, arquivo de linhas, PDF ou CSV da extração simples. "
+                                   "Também aceita vários arquivos, pastas (os PDFs dentro delas) e padrões glob.")
+    turmas_users.add_argument('-o', '--output', help="Arquivo de saída (só com uma entrada). Padrão: <entrada>_alunos.json.")
+    turmas_users.add_argument('--output-dir', help="Pasta de saída dos <entrada>_alunos.json. Padrão: a pasta de cada entrada.")
+    turmas_users.add_argument('-j', '--jobs', type=int, default=1,
+                              help="Arquivos processados ao mesmo tempo em um lote (padrão: 1, em sequência neste processo). "
+                                   "Cada processo mantém a própria JVM do tabula entre os arquivos.")
+
+    run_all = subparsers.add_parser('all', parents=[extraction, users],
+                                    help="Executa todas as etapas em memória e grava o JSON de turmas e o de usuários.")
+    run_all.add_argument('input', help="PDF do SEGES.")
+    run_all.add_argument('--output-dir', help="Pasta de saída. Padrão: a pasta do PDF.")
+
+    batch = subparsers.add_parser('batch', parents=[extraction],
+                                  help="Converte uma pasta de PDFs (um por escola) para o formato do sync-service.")
+    batch.add_argument('input', nargs='+', help="Pastas, PDFs ou padrões glob ('exportacoes/*.pdf').")
+    batch.add_argument('--output-dir',
+                       help="Pasta onde os dados_alunos_<data>_<escola>.json são gravados. "
+                            "Padrão: services/sync-service/data do repositório.")
+    batch.add_argument('--no-delta', action='store_true',
+                       help="Não grava o delta_alunos_<data>_<escola>.json com as diferenças em relação à exportação "
+                            "anterior da escola na pasta de saída.")
+    batch.add_argument('--dedupe', choices=DEDUPE_POLICIES, default=DEFAULT_DEDUPE_POLICY,
+                       help="O que fazer com um aluno que aparece em mais de uma turma ou escola do lote: manter só o "
+                            "registro do relatório mais recente, pela data no cabeçalho do PDF e depois pela ordem "
+                            "das entradas (keep-latest, padrão), manter todos (keep-both) ou mantê-los "
+                            "marcados com 'duplicado' (flag). Os casos vão para duplicados_alunos_<data>.json.")
+    batch.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                       help="Escolas convertidas ao mesmo tempo (padrão: número de CPUs).")
+    return parser
+
+
+@contextlib.contextmanager
+def open_output(path):
+    """
+    Abre o arquivo de saída. Com '-', escreve em stdout e manda as mensagens de progresso
+    para stderr, para não se misturarem à saída.
+    """
+    if path == '-':
+        output = sys.stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            yield output
+    else:
+        with open(path, 'w', encoding='utf-8') as output:
+            yield output
+
+
+def extract_options(args):
+    return {'workers': max(1, args.workers), 'use_cache': not args.no_cache, 'engine': args.engine,
+            'text_backend': args.text_backend}
+
+
+def run_pdf_rows(args):
+    output_path = args.output or default_output_path(args.input, '.rows.json')
+    with open_output(output_path) as output:
+        document = load_rows(args.input, **extract_options(args))
+        json.dump(document, output, ensure_ascii=False)
+        print(f"\n{len(document['tables'])} tabelas gravadas em: {output_path}")
+
+
+def run_rows_turmas(args):
+    output_path = args.output or default_output_path(args.input, '.ndjson' if args.ndjson else '.json')
+    with open_output(output_path) as output:
+        if args.ndjson:
+            from .student_parser import StudentParser
+
+            document = load_rows(args.input, **extract_options(args))
+            count = StudentParser(validate=not args.no_validate).write_ndjson(document, output)
+        else:
+            if args.input.lower().endswith('.csv'):
+                turmas_data = load_turmas(args.input)
+            else:
+                turmas_data = rows_to_turmas(load_rows(args.input, **extract_options(args)), not args.no_validate)
+            json.dump(flatten_turmas(turmas_data) if args.flat else turmas_data, output, ensure_ascii=False, indent=4)
+            count = sum(len(students) for students in turmas_data['turmas'].values())
+        print(f"\nConversão concluída! {count} alunos gravados em: {output_path}")
+
+
+def bulk_options(args, jobs=1):
+    """
+    Opções da carga em lote e do hash das senhas. Sem --hash-jobs, as CPUs são divididas entre os `jobs`
+    arquivos processados ao mesmo tempo, para os pools de hash não disputarem os mesmos núcleos.
+    """
+    hash_jobs = args.hash_jobs or max(1, (os.cpu_count() or 1) // max(1, jobs))
+    return {'bulk': args.bulk, 'chunk_size': args.chunk_size, 'hash_jobs': hash_jobs,
+            'rounds': args.bcrypt_rounds, 'hash_json': args.hash_passwords}
+
+
+def run_turmas_users(args):
+    jobs = max(1, min(args.jobs, len(args.input)))
+    convert = functools.partial(convert_users_file, output_dir=args.output_dir, school_id=args.school_id,
+                                district_id=args.district_id, existing_emails=args.existing_emails,
+                                validate=not args.no_validate, password_scheme=args.password_scheme,
+                                **bulk_options(args, jobs), **extract_options(args))
+    # As pastas de saída são criadas antes da extração e do hash das senhas, para um caminho
+    # inválido falhar logo, e não depois de todo o trabalho
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    if args.output and len(args.input) == 1:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    if len(args.input) == 1:
+        try:
+            convert(args.input[0], output_path=args.output)
+        except ValueError as e:
+            print(f"Não foi possível extrair dados de alunos: {e}")
+            return 1
+        return
+
+    if args.output:
+        print("Erro: --output só pode ser usado com uma entrada; use --output-dir.", file=sys.stderr)
+        return 1
+    paths = args.input
+    print(f"Lote: {len(paths)} arquivos, {jobs} processo(s)")
+    start = time.perf_counter()
+    initializer = start_tabula_session if args.engine == 'tabula' else None
+    results = run_batch(paths, convert, jobs=jobs, initializer=initializer)
+    print_batch_report(results, time.perf_counter() - start)
+    return 1 if any(result['erro'] for result in results) else 0
+
+
+def run_all(args):
+    output_dir = args.output_dir or os.path.dirname(os.path.abspath(args.input))
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.join(output_dir, os.path.splitext(os.path.basename(args.input))[0])
+
+    document = load_rows(args.input, **extract_options(args))
+    turmas_data = rows_to_turmas(document, not args.no_validate)
+    with open(f"{stem}.json", 'w', encoding='utf-8') as output:
+        json.dump(turmas_data, output, ensure_ascii=False, indent=4)
+    print(f"\nTurmas gravadas em: {stem}.json")
+
+    turmas = TurmaIndex.from_turmas(turmas_data)
+    students = turmas_to_users(turmas_data, args.school_id, args.district_id, args.existing_emails, turmas,
+                               args.password_scheme)
+    if not students:
+        print("Não foi possível extrair dados de alunos.")
+        return 1
+    save_users(students, f"{stem}_alunos.json", turmas, **bulk_options(args))
+
+
+def run_batch_command(args):
+    output_dir = args.output_dir or SYNC_DATA_DIR
+    if not args.output_dir and not os.path.isdir(os.path.dirname(output_dir)):
+        print("Erro: informe --output-dir (a pasta do sync-service não foi encontrada).", file=sys.stderr)
+        return 1
+    # Arquivos com o mesmo nome simplificado ("escola.pdf" e "escola (2).pdf") gravariam a mesma exportação
+    slugs = {}
+    for path in args.input:
+        slugs.setdefault(school_slug(path), []).append(os.path.basename(path))
+    repeated = [names for names in slugs.values() if len(names) > 1]
+    if repeated:
+        print("Erro: arquivos da mesma escola no lote (use só o relatório mais recente): "
+              + "; ".join(", ".join(names) for names in repeated), file=sys.stderr)
+        return 1
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Um único carimbo de data para o lote inteiro. O delta de cada escola é gravado só depois
+    # de resolvidos os alunos repetidos entre as escolas (finish_school_files)
+    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+    convert = functools.partial(convert_school_file, output_dir=output_dir, timestamp=timestamp,
+                                validate=not args.no_validate, delta=False, **extract_options(args))
+
+    jobs = max(1, min(args.jobs, len(args.input)))
+    print(f"Lote: {len(args.input)} escolas, {jobs} processo(s), saída em {output_dir}")
+    start = time.perf_counter()
+    initializer = start_tabula_session if args.engine == 'tabula' else None
+    results = run_batch(args.input, convert, jobs=jobs, initializer=initializer)
+    duplicates = finish_school_files(results, output_dir, timestamp, args.dedupe, delta=not args.no_delta)
+    print_batch_report(results, time.perf_counter() - start, duplicates=duplicates)
+    return 1 if any(result['erro'] for result in results) else 0
+
+
+COMMANDS = {
+    'pdf-rows': run_pdf_rows,
+    'rows-turmas': run_rows_turmas,
+    'turmas-users': run_turmas_users,
+    'all': run_all,
+    'batch': run_batch_command,
+}
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if isinstance(args.input, list):
+        # Pastas e padrões glob são expandidos nos arquivos que contêm
+        args.input = expand_inputs(args.input)
+        if not args.input:
+            print("Erro: nenhum arquivo encontrado nas entradas informadas.", file=sys.stderr)
+            return 1
+    elif not os.path.exists(args.input):
+        print(f"Erro: arquivo não encontrado: {args.input}", file=sys.stderr)
+        return 1
+
+    profiler = ImportProfiler() if args.profile_startup else None
+    if profiler:
+        profiler.start()
+    try:
+        return COMMANDS[args.command](args) or 0
+    except Exception as e:
+        print(f"\nOcorreu um erro durante a conversão: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if profiler:
+            profiler.stop()
+            profiler.report(sys.stderr)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
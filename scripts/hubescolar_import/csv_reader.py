@@ -0,0 +1,108 @@
+import csv
+import os
+from datetime import datetime
+
+from .parsing import PHONE_RE, collapse_whitespace, normalize_inep
+from .student_index import inep_index
+
+# Leitura do CSV gerado pela antiga extração simples (uma coluna "Turma" seguida das células de cada linha).
+
+def clean_text(text):
+    """Limpa o texto removendo quebras de linha e espaços extras."""
+    if not text:
+        return ""
+    return ' '.join(text.replace('\n', ' ').split())
+
+def extract_phones(phones_text):
+    """
+    Extrai todos os telefones de uma string.
+    Identifica telefones no formato (XX) XXXXX-XXXX ou (XX) XXXX-XXXX.
+    """
+    if not phones_text or phones_text.strip() == "":
+        return []
+    
+    # Telefones no formato (DD) DDDDD-DDDD ou (DD) DDDD-DDDD, com espaços extras removidos
+    return [collapse_whitespace(match.group(0)) for match in PHONE_RE.finditer(phones_text)]
+
+def normalize_gender(gender):
+    """Converte o código de sexo (M/F) para formato completo."""
+    if not gender:
+        return ""
+    
+    gender = gender.strip().upper()
+    if gender == 'M':
+        return 'masculino'
+    elif gender == 'F':
+        return 'feminino'
+    return gender
+
+def normalize_age(age_str):
+    """Remove 'anos' e retorna apenas o número."""
+    if not age_str:
+        return ""
+    
+    return age_str.replace('anos', '').strip()
+
+def process_csv_to_json(csv_file_path):
+    """
+    Processa o arquivo CSV e o converte para o formato JSON desejado
+    (o formato do sync-service: {'metadados': {...}, nome_da_turma: [aluno, ...]}),
+    com o índice dos alunos pelo ID INEP nos metadados.
+    """
+    data = {
+        "metadados": {
+            "data_emissao": datetime.now().strftime("%a, %d de %B de %Y, %H:%M"),
+            "escola": "EEEFM JOAO CRISOSTOMO BELESA",
+            "arquivo_origem": os.path.basename(csv_file_path).replace(".csv", ".PDF")
+        }
+    }
+    
+    current_class = None
+    
+    with open(csv_file_path, 'r', encoding='utf-8') as csvfile:
+        csvreader = csv.reader(csvfile)
+        headers = next(csvreader)  # Pular cabeçalho
+        
+        for row in csvreader:
+            if not row or len(row) < 9:  # Verificar se a linha tem dados suficientes
+                continue
+            
+            turma = row[0]
+            
+            # Verificar se é uma linha de cabeçalho de turma
+            if "Col0" in row[1:] or "ID" in row[1:]:
+                continue
+                
+            # Inicializar a turma no dicionário se ela não existir
+            if turma != current_class:
+                current_class = turma
+                if turma not in data:
+                    data[turma] = []
+            
+            # Extrair e processar os dados do aluno
+            nome = clean_text(row[3])  # Nome está na coluna 3
+            dt_nascimento = clean_text(row[4])  # Data de nascimento na coluna 4
+            sexo = normalize_gender(row[5])  # Sexo na coluna 5
+            idade = normalize_age(row[6])  # Idade na coluna 6
+            
+            # Processar telefones
+            telefones = extract_phones(row[7])  # Telefones na coluna 7
+            telefone = telefones[0] if telefones else ""
+            id_inep = normalize_inep(row[2])  # ID INEP na coluna 2 (vazio para alguns alunos)
+            
+            # Criar objeto do aluno apenas se tiver nome
+            if nome:
+                aluno = {
+                    "nome": nome,
+                    "dt_nascimento": dt_nascimento,
+                    "sexo": sexo,
+                    "idade": idade,
+                    "telefone": telefone,
+                    "telefones": telefones,
+                    "id_inep": id_inep
+                }
+                
+                data[turma].append(aluno)
+    
+    data["metadados"]["indice_inep"] = inep_index({turma: alunos for turma, alunos in data.items() if turma != "metadados"})
+    return data
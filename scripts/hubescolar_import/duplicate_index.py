@@ -0,0 +1,160 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .snapshot_delta import iter_snapshot_students, name_key
+from .student_index import inep_index
+
+# Alunos repetidos nas exportações de um lote (arquivos no formato do sync-service:
+# {'metadados': {...}, nome_da_turma: [aluno, ...]}): o mesmo aluno em duas turmas da mesma escola
+# ou em duas escolas (transferência). Se os dois registros chegarem ao sync-service, a turma
+# (gradeId) do aluno troca a cada sincronização.
+
+# Políticas para os alunos repetidos:
+#   keep-latest  mantém só os registros da exportação mais recente; se ela tiver o aluno em mais de uma
+#                turma, não há como saber qual vale, e esses registros ficam marcados como no flag
+#   keep-both    mantém todos os registros e só os lista no relatório
+#   flag         mantém todos os registros, marcados com a chave do aluno em 'duplicado'
+DEDUPE_POLICIES = ('keep-latest', 'keep-both', 'flag')
+DEFAULT_DEDUPE_POLICY = 'keep-latest'
+
+
+class Occurrence(NamedTuple):
+    """
+    Posição de um registro de aluno no lote: exportação (índice na lista), turma e posição na turma.
+    """
+    fonte: int
+    turma: str
+    posicao: int
+
+
+def find_duplicates(snapshots: List[dict]) -> List[Tuple[str, List[Occurrence]]]:
+    """
+    Grupos de registros do mesmo aluno nas exportações, da mais antiga para a mais recente.
+    Uma única passada com dois índices (hash): pelo ID INEP e pelo nome normalizado mais a data de nascimento.
+    Registros com o mesmo ID INEP são do mesmo aluno; com o mesmo nome e data também, a não ser que os dois
+    tenham ID INEP e os IDs sejam diferentes (homônimos nascidos no mesmo dia).
+    Retorna [(chave do aluno, [Occurrence, ...]), ...], só com os grupos de mais de um registro.
+    """
+    by_inep: Dict[str, int] = {}
+    by_name: Dict[str, int] = {}
+    groups: List[List[Occurrence]] = []
+    group_keys: List[str] = []
+    group_ineps: List[Optional[str]] = []
+
+    for source, snapshot in enumerate(snapshots):
+        positions: Dict[str, int] = {}
+        for turma, student in iter_snapshot_students(snapshot):
+            position = positions[turma] = positions.get(turma, -1) + 1
+            id_inep = student.get('id_inep')
+            name = name_key(student)
+
+            group = by_inep.get(id_inep) if id_inep else None
+            if group is None:
+                group = by_name.get(name)
+                if group is not None and id_inep and group_ineps[group] not in (None, id_inep):
+                    group = None
+            if group is None:
+                group = len(groups)
+                groups.append([])
+                group_keys.append(name)
+                group_ineps.append(None)
+
+            groups[group].append(Occurrence(source, turma, position))
+            if id_inep and group_ineps[group] is None:
+                group_ineps[group] = id_inep
+                group_keys[group] = f"inep:{id_inep}"
+            if id_inep:
+                by_inep.setdefault(id_inep, group)
+            by_name.setdefault(name, group)
+
+    return [(key, occurrences) for key, occurrences in zip(group_keys, groups) if len(occurrences) > 1]
+
+
+def latest_occurrences(occurrences: List[Occurrence]) -> List[Occurrence]:
+    """
+    Registros mantidos pelo keep-latest: os da exportação mais recente do grupo (a última da lista).
+    """
+    return [occurrence for occurrence in occurrences if occurrence.fonte == occurrences[-1].fonte]
+
+
+def apply_policy(snapshots: List[dict], duplicates: List[Tuple[str, List[Occurrence]]], policy: str) -> List[int]:
+    """
+    Aplica a política aos grupos de find_duplicates, alterando as exportações no lugar.
+    Com keep-latest (ver latest_occurrences), os registros mantidos ficam com o ID INEP do grupo se não
+    tiverem o seu, os que sobram na mesma exportação são marcados em 'duplicado', e os
+    registros removidos mudam a posição dos seguintes, então o índice pelo ID INEP dos metadados
+    (ver student_index.inep_index) é refeito.
+    Retorna os índices das exportações alteradas.
+    """
+    if policy not in DEDUPE_POLICIES:
+        raise ValueError(f"Política de duplicados desconhecida: {policy}")
+    if policy == 'keep-both':
+        return []
+
+    changed = set()
+    if policy == 'flag':
+        for key, occurrences in duplicates:
+            for occurrence in occurrences:
+                snapshots[occurrence.fonte][occurrence.turma][occurrence.posicao]['duplicado'] = key
+                changed.add(occurrence.fonte)
+        return sorted(changed)
+
+    removed: Dict[Tuple[int, str], set] = {}
+    for key, occurrences in duplicates:
+        kept = latest_occurrences(occurrences)
+        for occurrence in occurrences[:-len(kept)]:
+            removed.setdefault((occurrence.fonte, occurrence.turma), set()).add(occurrence.posicao)
+        for occurrence in kept:
+            student = snapshots[occurrence.fonte][occurrence.turma][occurrence.posicao]
+            if len(kept) > 1:
+                student['duplicado'] = key
+                changed.add(occurrence.fonte)
+            if key.startswith('inep:') and not student.get('id_inep'):
+                student['id_inep'] = key[len('inep:'):]
+                changed.add(occurrence.fonte)
+    for (source, turma), positions in removed.items():
+        students = snapshots[source][turma]
+        snapshots[source][turma] = [student for position, student in enumerate(students) if position not in positions]
+        changed.add(source)
+    for source in changed:
+        metadata = snapshots[source].get('metadados')
+        if metadata is not None and 'indice_inep' in metadata:
+            metadata['indice_inep'] = inep_index({turma: students for turma, students in snapshots[source].items()
+                                                  if turma != 'metadados'})
+    return sorted(changed)
+
+
+def duplicates_report(snapshots: List[dict], names: List[str],
+                      duplicates: List[Tuple[str, List[Occurrence]]], policy: str) -> dict:
+    """
+    Relatório dos alunos repetidos: para cada aluno, os registros encontrados (arquivo, escola, turma)
+    e se ficaram na saída. `names` é o nome do arquivo de cada exportação.
+    Deve ser montado antes de apply_policy, enquanto as posições ainda valem.
+    """
+    records = []
+    transfers = 0
+    removed = 0
+    for key, occurrences in duplicates:
+        kept = len(latest_occurrences(occurrences)) if policy == 'keep-latest' else len(occurrences)
+        removed += len(occurrences) - kept
+        first = snapshots[occurrences[0].fonte][occurrences[0].turma][occurrences[0].posicao]
+        schools = {occurrence.fonte for occurrence in occurrences}
+        transfers += len(schools) > 1
+        records.append({
+            'chave': key,
+            'nome': first.get('nome'),
+            'dt_nascimento': first.get('dt_nascimento'),
+            'tipo': 'transferencia' if len(schools) > 1 else 'mesma_escola',
+            'registros': [{
+                'arquivo': names[occurrence.fonte],
+                'escola': snapshots[occurrence.fonte].get('metadados', {}).get('escola'),
+                'turma': occurrence.turma,
+                'mantido': index >= len(occurrences) - kept,
+            } for index, occurrence in enumerate(occurrences)],
+        })
+    counts = {
+        'alunos': len(duplicates),
+        'transferencias': transfers,
+        'mesma_escola': len(duplicates) - transfers,
+        'registros_removidos': removed,
+    }
+    return {'metadados': {'politica': policy, 'arquivos': names, 'contagem': counts}, 'duplicados': records}
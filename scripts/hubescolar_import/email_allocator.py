@@ -0,0 +1,86 @@
+import unicodedata
+
+from .parsing import NON_ALPHANUMERIC_RE, STUDENT_EMAIL_RE
+
+# Geração dos e-mails institucionais dos alunos: nome.sobrenome@aluno.edu.es.gov.br,
+# com sufixo numérico (nome.sobrenome1, nome.sobrenome2, ...) quando o e-mail já existe.
+
+EMAIL_DOMAIN = "aluno.edu.es.gov.br"
+
+
+# Função para normalizar texto
+def normalize_text(text):
+    if not isinstance(text, str):
+        return ""
+    normalized = unicodedata.normalize('NFKD', text.lower())
+    normalized = ''.join([c for c in normalized if not unicodedata.combining(c)])
+    normalized = NON_ALPHANUMERIC_RE.sub('', normalized)
+    return normalized
+
+
+class EmailAllocator:
+    """
+    Distribui e-mails únicos de aluno.
+
+    Para cada base (nome.sobrenome) guarda o próximo sufixo a tentar, então o aluno seguinte
+    com a mesma base não volta a testar nome.sobrenome1, nome.sobrenome2, ... desde o início:
+    cada e-mail custa O(1) amortizado, mesmo com milhares de "maria.silva" em um distrito.
+    As partes do nome já normalizadas (NFKD + regex) ficam em cache, porque os mesmos
+    nomes e sobrenomes se repetem em quase todas as turmas.
+
+    O resultado é o mesmo da busca sequencial anterior: o menor sufixo livre de cada base.
+    """
+
+    def __init__(self, existing_emails=()):
+        self.taken = set()
+        self.next_suffix = {}  # base -> próximo sufixo a tentar (0 = sem sufixo)
+        self._normalized = {}  # parte do nome -> parte normalizada
+        for email in existing_emails:
+            self.reserve(email)
+
+    @classmethod
+    def from_dump(cls, path):
+        """
+        Cria o alocador com os e-mails de aluno de um dump da tabela users do users-service
+        (SQL do mysqldump, CSV ou JSON): qualquer e-mail @aluno.edu.es.gov.br no arquivo é reservado.
+        """
+        with open(path, 'r', encoding='utf-8', errors='replace') as dump:
+            allocator = cls(STUDENT_EMAIL_RE.findall(dump.read()))
+        print(f"{len(allocator.taken)} e-mails de alunos já cadastrados carregados de {path}")
+        return allocator
+
+    def reserve(self, email):
+        """
+        Marca um e-mail como já usado.
+        """
+        self.taken.add(email.strip().lower())
+
+    def normalize(self, part):
+        normalized = self._normalized.get(part)
+        if normalized is None:
+            normalized = self._normalized[part] = normalize_text(part)
+        return normalized
+
+    def email_base(self, name):
+        """
+        Primeiro e último nome normalizados (nome.sobrenome), ou só o nome se houver uma única parte.
+        """
+        name_parts = name.split()
+        if len(name_parts) < 2:
+            return self.normalize(name_parts[0])
+        return f"{self.normalize(name_parts[0])}.{self.normalize(name_parts[-1])}"
+
+    def allocate(self, name):
+        """
+        Retorna um e-mail ainda não usado para o nome e o reserva.
+        """
+        base = self.email_base(name)
+        suffix = self.next_suffix.get(base, 0)
+        email = f"{base}{suffix or ''}@{EMAIL_DOMAIN}"
+        # Só avança sobre e-mails reservados de fora (dump) ou gerados a partir de outra base
+        while email in self.taken:
+            suffix += 1
+            email = f"{base}{suffix}@{EMAIL_DOMAIN}"
+        self.next_suffix[base] = suffix + 1
+        self.taken.add(email)
+        return email
@@ -0,0 +1,112 @@
+import os
+import json
+import gzip
+import hashlib
+from typing import Optional
+
+# Diretório padrão do cache (pode ser alterado com a variável de ambiente EXTRACTION_CACHE_DIR)
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'hubescolar', 'extraction')
+# Tamanho máximo total do cache em MB (variável de ambiente EXTRACTION_CACHE_MAX_MB)
+DEFAULT_MAX_MB = 200
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Calcula o SHA-256 do conteúdo de um arquivo, lendo em blocos.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Cache em disco das linhas brutas das tabelas extraídas de um PDF.
+
+    A chave é o SHA-256 do PDF mais o nome e a versão do extrator, então um PDF
+    inalterado não passa de novo pelo Camelot/Tabula, e qualquer mudança no
+    extrator (nova versão) invalida as entradas antigas.
+    As entradas são JSON compactado com gzip. Quando o tamanho total passa do
+    limite, as entradas usadas há mais tempo (LRU, pela data de modificação) são removidas.
+    """
+
+    def __init__(self, namespace: str, version: str, cache_dir: Optional[str] = None, max_mb: Optional[int] = None):
+        self.namespace = namespace
+        self.version = version
+        self.cache_dir = cache_dir or os.getenv('EXTRACTION_CACHE_DIR') or DEFAULT_CACHE_DIR
+        max_mb = max_mb if max_mb is not None else int(os.getenv('EXTRACTION_CACHE_MAX_MB', DEFAULT_MAX_MB))
+        self.max_bytes = max_mb * 1024 * 1024
+
+    def key_for(self, pdf_path: str) -> str:
+        """
+        Monta a chave do cache para um PDF: <sha256>-<extrator>-<versão>.
+        """
+        return self.key_for_digest(file_sha256(pdf_path))
+
+    def key_for_digest(self, digest: str) -> str:
+        """
+        Monta a chave do cache a partir de um hash já calculado (ex: a impressão digital de uma página).
+        """
+        return f"{digest}-{self.namespace}-{self.version}"
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json.gz")
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Retorna os dados armazenados para a chave, ou None se não houver entrada válida.
+        """
+        entry_path = self._entry_path(key)
+        if not os.path.exists(entry_path):
+            return None
+        try:
+            with gzip.open(entry_path, 'rt', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"Entrada de cache inválida ignorada ({entry_path}): {e}")
+            return None
+        # Atualiza a data de modificação para marcar a entrada como usada recentemente (LRU)
+        os.utime(entry_path, None)
+        return data
+
+    def put(self, key: str, data: dict) -> None:
+        """
+        Grava os dados da chave e remove as entradas mais antigas se o cache passar do limite.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry_path = self._entry_path(key)
+        tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, separators=(',', ':'))
+        # Gravação atômica: outro processo nunca lê uma entrada pela metade
+        os.replace(tmp_path, entry_path)
+        self._evict(keep=entry_path)
+
+    def _evict(self, keep: str) -> None:
+        """
+        Remove as entradas usadas há mais tempo até o total caber em max_bytes.
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json.gz'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,105 @@
+from itertools import islice
+from typing import Dict, List, NamedTuple, Optional
+
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+# O pydantic só aceita o TypedDict do typing a partir do Python 3.12
+from typing_extensions import Annotated, TypedDict
+
+from .parsing import INEP_RE
+
+class Student(BaseModel):
+    """
+    Modelo Pydantic para representar os dados de um único aluno.
+    """
+    nome: str = Field(..., description="Nome completo do aluno.")
+    dt_nascimento: Optional[str] = Field("", description="Data de nascimento do aluno (DD/MM/AAAA).")
+    sexo: str = Field("indefinido", description="Sexo do aluno ('masculino' ou 'feminino').")
+    idade: int = Field(0, ge=0, description="Idade do aluno em anos.")
+    telefone: Optional[str] = Field(None, description="Primeiro telefone da lista do aluno, se houver.")
+    telefones: List[str] = Field([], description="Lista de todos os telefones do aluno.")
+    id_inep: Optional[str] = Field(None, pattern=INEP_RE.pattern, description="ID INEP do aluno (12 dígitos), se o relatório trouxer.")
+
+class StudentFields(TypedDict):
+    """
+    Os campos do Student, com as mesmas restrições, na forma de dict: validar uma lista deles com o
+    TypeAdapter devolve dicts prontos para o JSON, sem criar um modelo por aluno nem chamar model_dump.
+    """
+    nome: str
+    dt_nascimento: Optional[str]
+    sexo: str
+    idade: Annotated[int, Field(ge=0)]
+    telefone: Optional[str]
+    telefones: List[str]
+    id_inep: Optional[Annotated[str, Field(pattern=INEP_RE.pattern)]]
+
+class StudentRecord(NamedTuple):
+    """
+    Aluno reconstruído pelo parser, com os mesmos campos do Student.
+    Tupla leve, sem validação: é o que circula entre as etapas internas. O Pydantic valida
+    os alunos de uma vez só na saída (ver validate_students).
+    """
+    nome: str
+    dt_nascimento: str
+    sexo: str
+    idade: int
+    telefone: Optional[str]
+    telefones: List[str]
+    id_inep: Optional[str] = None
+
+class Metadata(BaseModel):
+    """
+    Modelo Pydantic para os metadados do documento PDF original.
+    """
+    data_emissao: str = Field(..., description="Data e hora da emissão do relatório no formato 'Dia, DD de Mês de AAAA, HH:MM'.")
+    data_relatorio: Optional[str] = Field(None, description="Data e hora do relatório no cabeçalho do PDF ('Em: ...'), no formato AAAA-MM-DDTHH:MM.")
+    escola: str = Field(..., description="Nome da escola extraído do PDF.")
+    arquivo_origem: str = Field(..., description="Nome do arquivo PDF original.")
+    flavor_por_pagina: Dict[int, str] = Field({}, description="Flavor do Camelot ('lattice' ou 'stream') usado em cada página, ou 'text' se lida pela camada de texto.")
+
+class PDFData(BaseModel):
+    """
+    Modelo Pydantic para a estrutura completa do JSON de saída.
+    """
+    metadados: Metadata = Field(..., description="Metadados do relatório PDF.")
+    # A chave do dicionário será o nome da turma (ex: "1ªIV01-EM")
+    # O valor será uma lista de objetos Student
+    turmas: Dict[str, List['Student']] = Field(..., description="Dicionário contendo os dados dos alunos organizados por turma.")
+
+    class Config:
+        arbitrary_types_allowed = True
+
+# Validação em lote dos alunos: uma chamada ao pydantic-core por documento (ou por lote do NDJSON),
+# em vez de um modelo Student criado e depois convertido em dict para cada aluno
+STUDENTS_ADAPTER = TypeAdapter(List[StudentFields])
+
+def validate_students(students: List[StudentRecord], validate: bool = True) -> List[Optional[dict]]:
+    """
+    Converte os alunos em dicts no formato do Student, na mesma ordem.
+    Com validate=True, todos passam pelo TypeAdapter de uma vez; cada aluno inválido é registrado
+    e fica como None na sua posição, como acontecia quando cada Student era criado na hora.
+    Com validate=False (fontes confiáveis), os registros são só convertidos em dicts.
+    """
+    fields = StudentRecord._fields
+    data = [dict(zip(fields, student)) for student in students]
+    if not validate:
+        return data
+    try:
+        return STUDENTS_ADAPTER.validate_python(data)
+    except ValidationError as e:
+        invalid = {}
+        for error in e.errors():
+            field = '.'.join(map(str, error['loc'][1:]))
+            invalid.setdefault(error['loc'][0], []).append(f"{field}: {error['msg']}")
+        for index, messages in invalid.items():
+            print(f"Aluno inválido ignorado: {data[index]['nome']} - Erro: {'; '.join(messages)}")
+        valid = iter(STUDENTS_ADAPTER.validate_python([student for index, student in enumerate(data) if index not in invalid]))
+        return [None if index in invalid else next(valid) for index in range(len(data))]
+
+def validate_turmas(turmas: Dict[str, List[StudentRecord]], validate: bool = True) -> Dict[str, List[dict]]:
+    """
+    Valida os alunos de todas as turmas em uma única chamada (ver validate_students) e os devolve
+    separados por turma, sem os inválidos.
+    """
+    validated = iter(validate_students([student for students in turmas.values() for student in students], validate))
+    return {turma: [student for student in islice(validated, len(students)) if student is not None]
+            for turma, students in turmas.items()}
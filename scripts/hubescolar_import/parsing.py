@@ -0,0 +1,146 @@
+import re
+from typing import List, Optional, Tuple
+
+# Padrões compartilhados por todas as etapas da importação do SEGES.
+# Todos são compilados uma única vez, na importação do módulo.
+
+# Telefone no formato (DD) DDDDD-DDDD ou (DD) DDDD-DDDD, com ou sem espaço após o DDD.
+# Grupos: DDD, primeira parte, segunda parte.
+PHONE_RE = re.compile(r'\((\d{2})\)\s*(\d{4,5})-(\d{4})')
+
+# Data DD/MM/AAAA. Grupos: dia, mês, ano.
+DATE_RE = re.compile(r'(\d{2})/(\d{2})/(\d{4})')
+
+# Data e hora do relatório no cabeçalho do SEGES: "Em: Sex, 16 de Maio de 2025, 14:02".
+# Grupos: dia, mês por extenso, ano, hora, minuto.
+REPORT_DATE_RE = re.compile(r'Em:\s*\w+,\s*(\d{1,2}) de (\w+) de (\d{4}),\s*(\d{1,2}):(\d{2})')
+
+# Meses por extenso do cabeçalho, em minúsculas ('março' também sem acento)
+MONTHS = {
+    'janeiro': 1, 'fevereiro': 2, 'marco': 3, 'março': 3, 'abril': 4, 'maio': 5, 'junho': 6,
+    'julho': 7, 'agosto': 8, 'setembro': 9, 'outubro': 10, 'novembro': 11, 'dezembro': 12,
+}
+
+# Início de um registro de aluno: número (ID) seguido, opcionalmente, do início do nome.
+LEADING_ID_RE = re.compile(r'^(\d+)\s*(.*)$', re.DOTALL)
+
+# Texto que começa com número (ID de aluno, idade "15 anos")
+LEADING_NUMBER_RE = re.compile(r'^\d+')
+
+# Qualquer sequência de espaços em branco (inclui quebras de linha)
+WHITESPACE_RE = re.compile(r'\s+')
+
+# ID INEP do aluno: 12 dígitos (o relatório quebra o número na coluna estreita: "1238374589 88")
+INEP_RE = re.compile(r'^\d{12}$')
+
+# Caracteres que não são letras minúsculas sem acento, dígitos ou espaço (usado na geração de e-mails)
+NON_ALPHANUMERIC_RE = re.compile(r'[^a-z0-9\s]')
+
+# E-mail institucional de aluno (aluno.edu.es.gov.br) em qualquer texto: dump SQL, CSV ou JSON da tabela users
+STUDENT_EMAIL_RE = re.compile(r'[a-z0-9._%+-]+@aluno\.edu\.es\.gov\.br', re.IGNORECASE)
+
+# Sequências de caracteres que não entram em nomes de arquivo gerados (texto já em minúsculas e sem acentos)
+NON_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+# Marca de cópia no fim do nome de um arquivo baixado de novo ou duplicado: "escola (2)", "escola - Copia",
+# "escola - Cópia (3)", "escola copy"
+COPY_SUFFIX_RE = re.compile(r'(?:\s*\(\d{1,2}\)|\s+-\s+c[oó]pia|\s+copy)+$', re.IGNORECASE)
+
+# Código de turma do SEGES: série, ª/º, turno, sequência e nível, ex: 1ªIV01-EM, 3ªM01-EM-ESP, 8ºM01-EF
+TURMA_CODE = r'\d+[ªº][A-Z]+\d{2}(?:-[A-Z]+)+'
+
+# Código de turma completo, separado em partes: série, turno, sequência e nível (ex: 3, 'M', '01', 'EM-ESP')
+TURMA_PARTS_RE = re.compile(r'^(?P<serie>\d+)[ªº](?P<turno>[A-Z]+)(?P<sequencia>\d{2})-(?P<nivel>[A-Z]+(?:-[A-Z]+)*)$')
+
+# Turma rotulada, "Turma: <nome>": rótulo em maiúsculas ou minúsculas e o nome até o fim da linha,
+# sem os espaços finais (nomes digitados como "EJA 1" têm espaços; ver turma_index.TurmaInfo)
+TURMA_LABEL_RE = re.compile(r'Turma:[^\S\n]*([^\n]*[^\s])', re.IGNORECASE)
+
+# Código de turma solto no texto. Fica separado do rótulo: uma alternação única das duas formas
+# mede mais lenta que as duas passadas (benchmarks/regex_registry.py)
+TURMA_CODE_RE = re.compile(r'(?<!\w)' + TURMA_CODE + r'(?!\w)')
+
+
+def collapse_whitespace(text: str) -> str:
+    """
+    Substitui qualquer sequência de espaços/quebras de linha por um único espaço e remove as pontas.
+    """
+    return WHITESPACE_RE.sub(' ', text).strip()
+
+
+def find_phones(text: str) -> List[Tuple[str, str, str]]:
+    """
+    Retorna todos os telefones do texto como tuplas (DDD, primeira parte, segunda parte).
+    Cada script formata o telefone como precisa.
+    """
+    if not isinstance(text, str):
+        return []
+    return PHONE_RE.findall(text)
+
+
+def find_date(text: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Retorna a primeira data DD/MM/AAAA do texto como (dia, mês, ano), ou None.
+    """
+    if not isinstance(text, str):
+        return None
+    match = DATE_RE.search(text)
+    return match.groups() if match else None
+
+
+def find_report_date(text: str) -> Optional[str]:
+    """
+    Data e hora do relatório ("Em: ..." no cabeçalho) como AAAA-MM-DDTHH:MM, que ordena como texto,
+    ou None se o texto não a tiver.
+    """
+    match = REPORT_DATE_RE.search(text or '')
+    month = MONTHS.get(match.group(2).lower()) if match else None
+    if not month:
+        return None
+    day, _, year, hour, minute = match.groups()
+    return f"{year}-{month:02d}-{int(day):02d}T{int(hour):02d}:{minute}"
+
+
+def normalize_inep(text: Optional[str]) -> Optional[str]:
+    """
+    ID INEP sem espaços, ou None se a célula estiver vazia ou não tiver os 12 dígitos.
+    """
+    inep = WHITESPACE_RE.sub('', text or '')
+    return inep if INEP_RE.match(inep) else None
+
+
+def split_leading_id(text: str) -> Optional[Tuple[str, str]]:
+    """
+    Se o texto começar com um número (ID), retorna (id, resto do texto); caso contrário None.
+    """
+    match = LEADING_ID_RE.match(text)
+    return (match.group(1), match.group(2).strip()) if match else None
+
+
+def find_turmas(text: str, labeled_only: bool = False) -> List[Tuple[int, str]]:
+    """
+    Encontra todas as turmas do texto: as rotuladas ("Turma: X") e, se labeled_only for False,
+    os códigos soltos fora dos trechos rotulados.
+    Retorna [(posição, nome_da_turma), ...] na ordem em que aparecem.
+    """
+    labeled = list(TURMA_LABEL_RE.finditer(text))
+    turmas = [(match.start(), match.group(1)) for match in labeled]
+    if labeled_only:
+        return turmas
+
+    spans = [match.span() for match in labeled]
+    for match in TURMA_CODE_RE.finditer(text):
+        if not any(start <= match.start() < end for start, end in spans):
+            turmas.append((match.start(), match.group()))
+    return sorted(turmas)
+
+
+def first_turma(text: str) -> Optional[str]:
+    """
+    Retorna a primeira turma do texto ("Turma: X" ou o código solto), ou None.
+    """
+    labeled = TURMA_LABEL_RE.search(text)
+    code = TURMA_CODE_RE.search(text, 0, labeled.start() if labeled else len(text))
+    if code:
+        return code.group()
+    return labeled.group(1) if labeled else None
@@ -0,0 +1,63 @@
+import functools
+import os
+import time
+from typing import List, Optional
+
+# Hash bcrypt das senhas dos alunos gerados, para a carga em lote na tabela users sem passar pelo
+# hook beforeCreate do User.js (que faz um bcrypt.hash por usuário, em série, na hora do cadastro).
+# O bcrypt só é importado quando há senhas a gerar (dependência opcional: pip install hubescolar-import[bulk]).
+
+# Custo usado pelo users-service (User.js: bcrypt.hash(password, 10)). Cada unidade a mais dobra o tempo de um hash.
+BCRYPT_ROUNDS = 10
+
+# Custos aceitos pelo bcrypt
+MIN_BCRYPT_ROUNDS = 4
+MAX_BCRYPT_ROUNDS = 31
+
+# Senhas enviadas de uma vez a cada processo do pool
+HASH_CHUNK_SIZE = 16
+
+
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+    """
+    Hash bcrypt ($2b$) da senha, com salt próprio. O bcryptjs do users-service compara esse formato.
+    """
+    import bcrypt
+
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('ascii')
+
+
+def hash_passwords(passwords: List[str], jobs: Optional[int] = None, rounds: int = BCRYPT_ROUNDS) -> List[str]:
+    """
+    Hash de cada senha, na mesma ordem, com custo `rounds`. O bcrypt é lento de propósito e não depende
+    de nada além da senha, então as senhas são divididas entre `jobs` processos (padrão: número de CPUs).
+    Com jobs <= 1, tudo roda neste processo. Registra a vazão (hashes/s) ao final.
+    """
+    if not MIN_BCRYPT_ROUNDS <= rounds <= MAX_BCRYPT_ROUNDS:
+        raise ValueError(f"Custo do bcrypt fora do intervalo {MIN_BCRYPT_ROUNDS}-{MAX_BCRYPT_ROUNDS}: {rounds}")
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(passwords)))
+    hash_one = functools.partial(hash_password, rounds=rounds)
+
+    start = time.perf_counter()
+    if jobs <= 1:
+        hashes = [hash_one(password) for password in passwords]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            hashes = list(executor.map(hash_one, passwords, chunksize=HASH_CHUNK_SIZE))
+    elapsed = time.perf_counter() - start
+    rate = len(hashes) / elapsed if elapsed else 0
+    print(f"Hash bcrypt (custo {rounds}) de {len(hashes)} senhas em {elapsed:.2f}s com {jobs} processo(s): "
+          f"{rate:.1f} hashes/s")
+    return hashes
+
+
+def hash_user_passwords(users: List[dict], jobs: Optional[int] = None, rounds: int = BCRYPT_ROUNDS) -> List[dict]:
+    """
+    Troca a senha de cada usuário gerado pelo hash dela (ver hash_passwords), no lugar.
+    Usuários assim só podem ser gravados sem o hook beforeCreate do User.js, que faria o hash do hash.
+    """
+    for user, password_hash in zip(users, hash_passwords([user['password'] for user in users], jobs, rounds)):
+        user['password'] = password_hash
+    return users
@@ -0,0 +1,535 @@
+from __future__ import annotations
+
+import os
+import hashlib
+from collections import Counter
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from .extraction_cache import ExtractionCache
+from .pdf_document import DEFAULT_TEXT_BACKEND, PDFDocument, PDFSource, expand_pages, open_document
+from .parsing import find_report_date, find_turmas, first_turma
+
+# camelot, fitz (PyMuPDF), PyPDF2 e tabula levam de 0,1 a 0,5 s cada para importar.
+# Eles são importados apenas dentro das funções que os usam, então um acerto do cache
+# ou um `--help` não pagam esse custo.
+# As funções que leem o PDF com o PyMuPDF ou o PyPDF2 aceitam o caminho ou um PDFDocument
+# já aberto (ver pdf_document.py), para que o arquivo seja aberto uma única vez por PDF.
+if TYPE_CHECKING:
+    import camelot
+
+# Versão do extrator, parte da chave do cache: incremente ao mudar a extração das tabelas
+EXTRACTOR_VERSION = "4"
+
+# Engines de extração de tabelas disponíveis ('text' lê a camada de texto e usa o Camelot só nas páginas que não conseguir ler)
+ENGINES = ('camelot', 'tabula', 'text')
+
+TABLE_AREAS = ['30,650,580,0']  # [x1,y1,x2,y2]
+
+CAMELOT_OPTIONS = {
+    'lattice': {
+        'table_areas': TABLE_AREAS,
+        'process_background': True,
+        'line_scale': 40,
+    },
+    'stream': {
+        # SEM process_background=True
+        'table_areas': TABLE_AREAS,
+        'row_tol': 10,
+        'column_tol': 5,
+        'edge_tol': 500,
+        'strip_text': '\n',
+        'flag_size': True,
+        'split_text': True,
+    },
+}
+
+# Quantidade mínima de linhas horizontais e verticais para considerar que a página tem grade (lattice)
+MIN_RULING_LINES = 4
+
+def _read_pdf_pages(pdf_path: str, pages: str, flavor: str) -> camelot.core.TableList:
+    """
+    Lê as tabelas de um intervalo de páginas. Fica no nível do módulo para poder
+    ser enviada aos processos do ProcessPoolExecutor.
+    """
+    import camelot
+
+    return camelot.read_pdf(pdf_path, pages=pages, flavor=flavor, **CAMELOT_OPTIONS[flavor])
+
+class PDFExtractor:
+    def __init__(self, text_backend: str = DEFAULT_TEXT_BACKEND):
+        # Backend de texto das páginas (ver pdf_document.TEXT_BACKENDS)
+        self.text_backend = text_backend
+
+    def extract_text_from_pdf(self, pdf: PDFSource, pages='all') -> str:
+        """
+        Extrai o texto de um PDF (todas as páginas ou as informadas em `pages`, ex: 1 ou '1-3').
+        """
+        try:
+            with open_document(pdf) as document:
+                return "".join(text for _, text in document.iter_text(pages, self.text_backend))
+        except Exception as e:
+            print(f"Erro ao extrair texto do PDF com {self.text_backend}: {e}")
+            raise
+
+    def count_pages(self, pdf: PDFSource) -> int:
+        """
+        Número de páginas do PDF (lê apenas a estrutura do arquivo, não o texto).
+        """
+        with open_document(pdf) as document:
+            return document.page_count
+
+    def extract_tables_from_pdf(self, pdf_path: str, pages: str = 'all', workers: int = 1,
+                                page_flavors: Optional[Dict[int, str]] = None) -> List[camelot.core.Table]:
+        """
+        Extrai tabelas de um PDF usando Camelot com configurações aprimoradas.
+        O flavor ('lattice' ou 'stream') é decidido uma única vez por página (ver select_page_flavors)
+        e somente ele é executado naquela página.
+        Com workers > 1, as páginas são divididas em intervalos processados em paralelo.
+        """
+        try:
+            if page_flavors is None:
+                page_flavors = self.select_page_flavors(pdf_path, pages)
+
+            tasks = self.plan_page_ranges(page_flavors, workers)
+            tables = self._read_tables(pdf_path, tasks, workers)
+
+            lattice_pages = sum(1 for flavor in page_flavors.values() if flavor == 'lattice')
+            print(f"Total de tabelas encontradas: {len(tables)} "
+                  f"({lattice_pages} páginas com lattice, {len(page_flavors) - lattice_pages} com stream)")
+            return tables
+            
+        except Exception as e:
+            print(f"Erro ao extrair tabelas do PDF com Camelot: {e}")
+            raise
+
+    def select_page_flavors(self, pdf: PDFSource, pages: str = 'all') -> Dict[int, str]:
+        """
+        Escolhe o flavor do Camelot para cada página contando as linhas de grade com o PyMuPDF.
+        Páginas com linhas horizontais e verticais suficientes usam 'lattice'; as demais, 'stream'.
+        Retorna um dicionário {número_da_página (1-based): flavor}.
+        """
+        page_flavors = {}
+        with open_document(pdf) as document:
+            for page_number in self.expand_pages(pages, document.page_count):
+                horizontal, vertical = self.count_ruling_lines(document.drawings(page_number))
+                if horizontal >= MIN_RULING_LINES and vertical >= MIN_RULING_LINES:
+                    page_flavors[page_number] = 'lattice'
+                else:
+                    page_flavors[page_number] = 'stream'
+        return page_flavors
+
+    def fingerprint_pages(self, pdf: PDFSource, page_flavors: Dict[int, str]) -> Dict[int, str]:
+        """
+        Calcula a impressão digital de cada página: SHA-256 do texto (page.get_text()) mais o flavor escolhido.
+        Páginas com a mesma impressão digital produzem as mesmas linhas de tabela.
+        """
+        fingerprints = {}
+        with open_document(pdf) as document:
+            for page_number, flavor in page_flavors.items():
+                digest = hashlib.sha256(document.text(page_number).encode('utf-8'))
+                digest.update(flavor.encode('utf-8'))
+                fingerprints[page_number] = digest.hexdigest()
+        return fingerprints
+
+    def count_ruling_lines(self, drawings: list) -> Tuple[int, int]:
+        """
+        Conta as linhas horizontais e verticais nos desenhos de uma página (PDFDocument.drawings).
+        Retângulos finos (bordas desenhadas como 're') também contam como linhas.
+        """
+        horizontal = vertical = 0
+        for path in drawings:
+            for item in path['items']:
+                if item[0] == 'l':
+                    start, end = item[1], item[2]
+                    if abs(start.y - end.y) < 1:
+                        horizontal += 1
+                    elif abs(start.x - end.x) < 1:
+                        vertical += 1
+                elif item[0] == 're':
+                    rect = item[1]
+                    if rect.height < 2 <= rect.width:
+                        horizontal += 1
+                    elif rect.width < 2 <= rect.height:
+                        vertical += 1
+        return horizontal, vertical
+
+    def plan_page_ranges(self, page_flavors: Dict[int, str], workers: int = 1) -> List[Tuple[str, str]]:
+        """
+        Agrupa páginas consecutivas com o mesmo flavor em intervalos no formato do Camelot (ex: '1-10').
+        Com workers > 1, cada grupo é dividido para que haja até `workers` intervalos por flavor.
+        Retorna uma lista [(páginas, flavor), ...] na ordem das páginas.
+        """
+        page_numbers = sorted(page_flavors)
+        if not page_numbers:
+            return []
+
+        chunk_size = -(-len(page_numbers) // workers) if workers > 1 else len(page_numbers)  # Arredondado para cima
+
+        groups = []
+        for page_number in page_numbers:
+            flavor = page_flavors[page_number]
+            last = groups[-1] if groups else None
+            if (last and last[1] == flavor and last[0][-1] == page_number - 1
+                    and len(last[0]) < chunk_size):
+                last[0].append(page_number)
+            else:
+                groups.append(([page_number], flavor))
+
+        return [(f"{group[0]}-{group[-1]}" if len(group) > 1 else str(group[0]), flavor)
+                for group, flavor in groups]
+
+    def expand_pages(self, pages: str, total_pages: int) -> List[int]:
+        """
+        Converte a especificação de páginas do Camelot ('all', '1,3-5', '2-end') em uma lista de números.
+        """
+        return expand_pages(pages, total_pages)
+
+    def _read_tables(self, pdf_path: str, tasks: List[Tuple[str, str]], workers: int) -> camelot.core.TableList:
+        """
+        Executa o Camelot para cada intervalo de páginas, em série ou dividindo os intervalos entre processos.
+        As tabelas são reunidas na ordem dos intervalos, então o resultado é o mesmo da execução em série.
+        """
+        import camelot
+
+        tables = []
+        if workers <= 1 or len(tasks) <= 1:
+            for pages, flavor in tasks:
+                tables.extend(_read_pdf_pages(pdf_path, pages, flavor))
+            return camelot.core.TableList(tables)
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        print(f"Extraindo {len(tasks)} intervalos de páginas com {workers} processos...")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # executor.map devolve os resultados na ordem dos intervalos submetidos
+            for range_tables in executor.map(_read_pdf_pages,
+                                             [pdf_path] * len(tasks),
+                                             [pages for pages, _ in tasks],
+                                             [flavor for _, flavor in tasks]):
+                tables.extend(range_tables)
+        return camelot.core.TableList(tables)
+
+    def read_school_name(self, pdf: PDFSource) -> str:
+        """
+        Nome da escola lido só da primeira página, onde fica o cabeçalho do relatório.
+        """
+        return self.get_school_name_from_header(self.extract_text_from_pdf(pdf, pages=1))
+
+    def read_turma_name(self, pdf: PDFSource) -> str:
+        """
+        Primeira turma ("Turma: X") do PDF, lendo as páginas em ordem só até encontrá-la.
+        """
+        with open_document(pdf) as document:
+            for _, text in document.iter_text(backend=self.text_backend):
+                turma = first_turma(text)
+                if turma:
+                    return turma
+        return "Turma Não Identificada"
+
+    def get_school_name_from_header(self, text: str) -> str:
+        """
+        Tenta extrair o nome da escola do cabeçalho do PDF.
+        Baseado no PDF fornecido, o nome da escola está na terceira linha após "GOVERNO DO ESTADO DO ES".
+        """
+        lines = text.split('\n')
+        for i, line in enumerate(lines):
+            if "SECRETARIA DE ESTADO DA EDUCACAO" in line:
+                # Buscar o nome da escola nas próximas linhas
+                for j in range(i + 1, min(i + 5, len(lines))):
+                    potential_school_name = lines[j].strip()
+                    # Heurística para identificar o nome da escola
+                    if (potential_school_name.startswith("EEEFM") or
+                        potential_school_name.startswith("EEEM") or
+                        potential_school_name.startswith("ESCOLA")
+                        ) and "RUA" not in potential_school_name and "SRE" not in potential_school_name:
+                        return potential_school_name.replace("\"", "").strip()
+        return "Escola Não Identificada"
+
+    def find_turma_headers(self, pdf: PDFSource) -> List[Tuple[int, float, str]]:
+        """
+        Encontra os cabeçalhos "Turma: X" do PDF em uma única passada pelos blocos de texto das páginas.
+        Retorna [(página, topo do bloco, turma), ...] em ordem de leitura, com o topo em coordenadas
+        do PDF (origem no canto inferior esquerdo), as mesmas do bbox das tabelas do Camelot.
+        """
+        headers = []
+        with open_document(pdf) as document:
+            for page in document.pages():
+                height = page.rect.height
+                for block in page.get_text('blocks', sort=True):
+                    text = block[4]
+                    if 'Turma:' not in text:
+                        continue
+                    for _, turma in find_turmas(text, labeled_only=True):
+                        headers.append((page.number + 1, height - block[1], turma))
+        return headers
+
+    def get_turma_from_text(self, text: str) -> str:
+        """
+        Extrai o nome da turma do texto do PDF.
+        Procura por "Turma: XXXXX".
+        """
+        return first_turma(text) or "Turma Não Identificada"
+
+
+def assign_table_turmas(tables: List[dict], headers: List[Tuple[int, float, str]]) -> None:
+    """
+    Preenche table['turma'] com o cabeçalho "Turma:" mais próximo que precede a tabela: o último,
+    em ordem de leitura, que começa antes da borda inferior dela (em uma página anterior ou acima
+    dessa borda na mesma página). O cabeçalho pode estar dentro da tabela, como na primeira página
+    do relatório, onde o Camelot inclui o título na grade.
+    Tabelas e cabeçalhos são percorridos juntos uma única vez. Tabelas sem página ou bbox
+    (extraídas com o tabula) ficam sem turma.
+    """
+    positioned = sorted((table for table in tables if table.get('page') and table.get('bbox')),
+                        key=lambda table: (table['page'], -table['bbox'][1]))
+    current = None
+    next_header = 0
+    for table in positioned:
+        position = (table['page'], -table['bbox'][1])
+        while next_header < len(headers) and (headers[next_header][0], -headers[next_header][1]) < position:
+            current = headers[next_header][2]
+            next_header += 1
+        table['turma'] = current
+
+
+def table_record(table, document: Optional[PDFDocument] = None) -> dict:
+    """
+    Linhas brutas de uma tabela do Camelot, com a página e o bbox (x1, y1, x2, y2 em coordenadas do PDF).
+    Com o documento aberto, as células que o Camelot juntou na vertical são separadas de novo (ver split_spanning_cells).
+    """
+    page_number = int(table.page)
+    if document is None:
+        rows = table.df.values.tolist()
+    else:
+        rows = split_spanning_cells(table, document.words(page_number), document.page(page_number).rect.height)
+    return {'page': page_number, 'bbox': [round(value, 2) for value in table._bbox], 'rows': rows}
+
+
+def split_spanning_cells(table, words: list, page_height: float) -> List[List[str]]:
+    """
+    Linhas da tabela do Camelot com as células que ocupam várias linhas da grade separadas linha a linha.
+    A área das tabelas (TABLE_AREAS) corta a página logo depois da coluna Telefones, que fica sem bordas:
+    o lattice junta a coluna inteira na primeira célula (a linha "Turma:" na primeira página de cada turma,
+    o primeiro aluno nas demais) e os outros alunos da página ficariam sem telefone.
+    O texto dessas células é redistribuído pela altura das palavras posicionadas da página (PDFDocument.words,
+    com a origem no canto superior esquerdo). Só quando todas as palavras da célula são encontradas na coluna,
+    na altura das linhas juntadas; nos demais casos (ex: o título "Turma:" que ocupa a linha toda) a célula fica como está.
+    """
+    rows = table.df.values.tolist()
+    for column, (left, right) in enumerate(table.cols):
+        start = 0
+        while start < len(rows):
+            end = start
+            while end + 1 < len(rows) and not table.cells[end][column].bottom:
+                end += 1
+            merged = rows[start][column]
+            if end > start and merged and not any(rows[row][column] for row in range(start + 1, end + 1)):
+                wanted = Counter(merged.split())
+                cells = column_cells(words, page_height, left, right, table.rows[start:end + 1], wanted)
+                if not +wanted:
+                    for row, text in enumerate(cells, start):
+                        rows[row][column] = text
+            start = end + 1
+    return rows
+
+
+def column_cells(words: list, page_height: float, left: float, right: float,
+                 row_bounds: List[Tuple[float, float]], wanted: Counter) -> List[str]:
+    """
+    Texto de cada linha da grade (row_bounds: [(topo, base), ...] em coordenadas do PDF, de cima para baixo)
+    com as palavras de `wanted` cujo centro fica entre left e right. Cada palavra usada é descontada de `wanted`;
+    palavras que não são da célula e cruzam a coluna (como a turma do título) ficam de fora.
+    As linhas de texto da célula são separadas por '\\n', como no Camelot.
+    """
+    lines: List[Dict[tuple, List[str]]] = [{} for _ in row_bounds]
+    for x0, y0, x1, y1, text, block, line, _ in words:
+        x, y = (x0 + x1) / 2, page_height - (y0 + y1) / 2
+        if not left <= x <= right or wanted[text] <= 0:
+            continue
+        for row, (top, bottom) in enumerate(row_bounds):
+            if bottom <= y <= top:
+                lines[row].setdefault((block, line), []).append(text)
+                wanted[text] -= 1
+                break
+    return ['\n'.join(' '.join(line_words) for line_words in row_lines.values()) for row_lines in lines]
+
+
+def _read_tabula_tables(pdf_path: str) -> List[dict]:
+    """
+    Lê as tabelas do PDF com o tabula (requer Java).
+    O tabula usa a primeira linha de cada tabela como cabeçalho; ela volta a ser a primeira
+    linha das tabelas para que a posição das colunas seja detectada como nas tabelas do Camelot.
+    """
+    import tabula
+
+    tables = []
+    # force_subprocess=False: com o jpype instalado, o tabula-py mantém uma única JVM por processo,
+    # reaproveitada por todos os PDFs lidos nele (sem jpype, cada chamada inicia um `java` novo)
+    for table in tabula.read_pdf(pdf_path, pages='all', multiple_tables=True, force_subprocess=False):
+        # Células vazias viram '' (como nas tabelas do Camelot)
+        rows = table.astype(object).where(table.notna(), '').astype(str).values.tolist()
+        tables.append({'page': None, 'rows': [[str(col) for col in table.columns]] + rows})
+    return tables
+
+
+def tabula_session_available() -> bool:
+    """
+    Indica se o tabula pode manter a JVM no processo (jpype instalado: `pip install hubescolar-import[tabula]`).
+    """
+    import importlib.util
+
+    return importlib.util.find_spec('jpype') is not None
+
+
+def start_tabula_session() -> None:
+    """
+    Prepara um processo para ler vários PDFs com o tabula: importa o tabula uma única vez
+    e avisa quando não há jpype (cada PDF pagaria a inicialização de uma JVM).
+    A JVM em si é iniciada na primeira leitura e fica viva até o fim do processo.
+    """
+    import tabula  # noqa: F401
+
+    if not tabula_session_available():
+        print("Aviso: jpype não está instalado; o tabula iniciará uma JVM para cada PDF.")
+
+
+class TableRowExtractor:
+    """
+    Etapa pdf→linhas: extrai as linhas brutas das tabelas e os metadados do PDF.
+    """
+
+    def __init__(self, workers: int = 1, use_cache: bool = True, engine: str = 'text',
+                 text_backend: str = DEFAULT_TEXT_BACKEND):
+        self.pdf_extractor = PDFExtractor(text_backend)
+        # Engine de extração das tabelas ('text', 'camelot' ou 'tabula')
+        self.engine = engine
+        # Número de processos usados na extração de tabelas (1 = em série)
+        self.workers = workers
+        # Cache das linhas extraídas, indexado pelo SHA-256 do PDF
+        self.cache = ExtractionCache(f'pdf-rows-{engine}', EXTRACTOR_VERSION) if use_cache else None
+        # Cache das linhas de cada página, indexado pela impressão digital da página (páginas lidas com o Camelot)
+        self.page_cache = ExtractionCache('pdf-rows-page', EXTRACTOR_VERSION) if use_cache and engine != 'tabula' else None
+
+    def extract_table_rows(self, pdf: PDFSource) -> Tuple[List[dict], Dict[int, str]]:
+        """
+        Retorna as linhas brutas de cada tabela ([{'page': n, 'bbox': [...], 'turma': t, 'rows': [[...], ...]}, ...])
+        e o flavor de cada página. Usa o cache quando o PDF não mudou. Caso contrário, roda o Camelot apenas
+        nas páginas cuja impressão digital mudou desde a última execução e reaproveita as linhas das demais.
+        A turma de cada tabela vem da posição dos cabeçalhos "Turma:" (ver assign_table_turmas).
+        """
+        with open_document(pdf) as document:
+            cache_key = None
+            if self.cache:
+                cache_key = self.cache.key_for_digest(document.sha256)
+                cached = self.cache.get(cache_key)
+                if cached:
+                    print(f"Tabelas carregadas do cache ({len(cached['tables'])} tabelas).")
+                    page_flavors = {int(page): flavor for page, flavor in cached['page_flavors'].items()}
+                    return cached['tables'], page_flavors
+
+            if self.engine == 'tabula':
+                table_rows, page_flavors = _read_tabula_tables(document.path), {}
+                print(f"Total de tabelas encontradas com o tabula: {len(table_rows)}")
+            else:
+                if self.engine == 'text':
+                    table_rows, page_flavors = self.extract_text_layer_rows(document)
+                else:
+                    table_rows, page_flavors = self.extract_camelot_rows(document)
+                assign_table_turmas(table_rows, self.pdf_extractor.find_turma_headers(document))
+
+        if self.cache and table_rows:
+            self.cache.put(cache_key, {'tables': table_rows, 'page_flavors': page_flavors})
+        return table_rows, page_flavors
+
+    def extract_text_layer_rows(self, document: PDFDocument) -> Tuple[List[dict], Dict[int, str]]:
+        """
+        Extrai as linhas pela camada de texto (ver text_layer.TextLayerExtractor) e, só nas páginas
+        que ela não conseguir ler com segurança, com o Camelot. O flavor dessas páginas é 'text'.
+        """
+        from .text_layer import TextLayerExtractor
+
+        table_rows, fallback_pages = TextLayerExtractor().extract_tables(document)
+        page_flavors = {table['page']: 'text' for table in table_rows}
+        print(f"Páginas lidas pela camada de texto: {len(page_flavors)}; páginas para o Camelot: {len(fallback_pages)}")
+        if fallback_pages:
+            camelot_rows, camelot_flavors = self.extract_camelot_rows(document, ','.join(map(str, fallback_pages)))
+            # sorted é estável: as tabelas de uma mesma página mantêm a ordem
+            table_rows = sorted(table_rows + camelot_rows, key=lambda table: table['page'])
+            page_flavors = dict(sorted({**page_flavors, **camelot_flavors}.items()))
+        return table_rows, page_flavors
+
+    def extract_camelot_rows(self, document: PDFDocument, pages: str = 'all') -> Tuple[List[dict], Dict[int, str]]:
+        """
+        Extrai as linhas com o Camelot, reaproveitando do cache as páginas cuja impressão digital não mudou.
+        A escolha do flavor e as impressões digitais usam o documento aberto; o Camelot lê o arquivo pelo caminho.
+        """
+        page_flavors = self.pdf_extractor.select_page_flavors(document, pages)
+        if not self.page_cache:
+            tables = self.pdf_extractor.extract_tables_from_pdf(document.path, workers=self.workers, page_flavors=page_flavors)
+            return [table_record(table, document) for table in tables], page_flavors
+
+        # Reaproveitar as páginas que não mudaram. A impressão digital não depende da posição da página,
+        # então a entrada pode ter sido gravada com outro número de página (ex: um relatório com as páginas
+        # em outra ordem): cada tabela reaproveitada recebe o número da página atual.
+        fingerprints = self.pdf_extractor.fingerprint_pages(document, page_flavors)
+        tables_by_page = {}
+        for page_number, fingerprint in fingerprints.items():
+            cached_page = self.page_cache.get(self.page_cache.key_for_digest(fingerprint))
+            if cached_page is not None:
+                tables_by_page[page_number] = [dict(table, page=page_number) for table in cached_page['tables']]
+
+        changed_flavors = {page: flavor for page, flavor in page_flavors.items() if page not in tables_by_page}
+        print(f"Páginas reaproveitadas do cache: {len(tables_by_page)}; páginas a extrair: {len(changed_flavors)}")
+
+        if changed_flavors:
+            tables = self.pdf_extractor.extract_tables_from_pdf(document.path, workers=self.workers, page_flavors=changed_flavors)
+            fresh_tables = {page: [] for page in changed_flavors}
+            for table in tables:
+                fresh_tables[int(table.page)].append(table_record(table, document))
+            for page_number, page_tables in fresh_tables.items():
+                self.page_cache.put(self.page_cache.key_for_digest(fingerprints[page_number]), {'tables': page_tables})
+            tables_by_page.update(fresh_tables)
+
+        # Remontar as tabelas na ordem das páginas
+        return [table for page_number in sorted(tables_by_page) for table in tables_by_page[page_number]], page_flavors
+
+    def extract_document(self, pdf_path: str) -> dict:
+        """
+        Extrai texto, tabelas e metadados do PDF.
+        Retorna o documento de linhas: {'metadados': {...}, 'turma': nome_da_turma, 'paginas': n, 'tables': [...]},
+        que é também o formato do arquivo gravado pela etapa pdf→linhas.
+        O PDF é aberto uma única vez (PDFDocument) e o mesmo handle serve ao texto, às tabelas e à contagem de páginas.
+        Os metadados são lidos só das primeiras páginas: o cabeçalho (escola e data do relatório) da primeira
+        e a turma de onde ela aparecer primeiro (ver read_turma_name).
+        """
+        from .models import Metadata
+
+        print(f"Iniciando processamento do PDF: {pdf_path}")
+
+        with PDFDocument(pdf_path) as document:
+            # 1. Extrair tabelas
+            tables, page_flavors = self.extract_table_rows(document)
+            page_count = document.page_count
+
+            # 2. Extrair metadados: o cabeçalho da escola está na primeira página e a primeira
+            # turma logo no início, então o texto do PDF inteiro não é necessário
+            header_text = self.pdf_extractor.extract_text_from_pdf(document, pages=1)
+            school_name = self.pdf_extractor.get_school_name_from_header(header_text)
+            report_date = find_report_date(header_text)
+            turma_name = self.pdf_extractor.read_turma_name(document)
+
+
+        # Formatar data de emissão
+        current_time = datetime.now()
+        data_emissao_str = current_time.strftime("%a, %d de %B de %Y, %H:%M").replace('Sex', 'Sex,').replace('May', 'Maio').replace('Apr', 'Abril').replace('Jun', 'Junho').replace('Jul', 'Julho').replace('Aug', 'Agosto').replace('Sep', 'Setembro').replace('Oct', 'Outubro').replace('Nov', 'Novembro').replace('Dec', 'Dezembro').replace('Jan', 'Janeiro').replace('Feb', 'Fevereiro').replace('Mar', 'Março') # Simplificação para meses em português
+
+        metadata = Metadata(
+            data_emissao=data_emissao_str,
+            data_relatorio=report_date,
+            escola=school_name,
+            arquivo_origem=os.path.basename(pdf_path),
+            flavor_por_pagina=page_flavors
+        )
+        return {'metadados': metadata.model_dump(by_alias=True), 'turma': turma_name,
+                'paginas': page_count, 'tables': tables}
@@ -0,0 +1,310 @@
+import json
+import os
+import unicodedata
+
+from .bulk_export import DEFAULT_CHUNK_SIZE
+from .csv_reader import process_csv_to_json
+from .password_hash import BCRYPT_ROUNDS
+from .duplicate_index import DEFAULT_DEDUPE_POLICY, apply_policy, duplicates_report, find_duplicates
+from .email_allocator import EmailAllocator
+from .parsing import COPY_SUFFIX_RE, NON_SLUG_RE
+from .pdf_document import DEFAULT_TEXT_BACKEND
+from .snapshot_delta import delta_counts, diff_snapshots, find_previous_snapshot
+from .pdf_extractor import TableRowExtractor
+from .turma_index import TurmaIndex
+from .user_builder import DEFAULT_PASSWORD_SCHEME, build_users
+
+# Etapas da importação, encadeadas em memória:
+#   pdf→linhas      TableRowExtractor.extract_document  -> {'metadados', 'turma', 'paginas', 'tables'}
+#   linhas→turmas   StudentParser.build_turmas          -> {'metadados', 'turmas': {turma: [aluno, ...]}}
+#   turmas→usuários build_users                         -> [usuário, ...] no formato do users-service
+# Cada etapa também aceita o arquivo gravado pela etapa anterior, então elas podem ser executadas separadamente.
+
+
+def ascii_text(text):
+    """
+    Remove os acentos do texto (NFKD sem as marcas combinantes).
+    """
+    return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+
+
+def read_json(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def pdf_to_rows(pdf_path, workers=1, use_cache=True, engine='text', text_backend=DEFAULT_TEXT_BACKEND):
+    """
+    Etapa pdf→linhas.
+    """
+    extractor = TableRowExtractor(workers=workers, use_cache=use_cache, engine=engine, text_backend=text_backend)
+    return extractor.extract_document(pdf_path)
+
+
+def rows_to_turmas(document, validate=True):
+    """
+    Etapa linhas→turmas. validate=False não valida os alunos com o Pydantic (fontes confiáveis).
+    """
+    # Importado aqui: o parser depende do pydantic, que a leitura do CSV e a etapa de usuários não usam
+    from .student_parser import StudentParser
+
+    return StudentParser(validate=validate).build_turmas(document)
+
+
+def turmas_to_users(turmas_data, school_id, district_id, existing_emails=None, turmas=None,
+                    password_scheme=DEFAULT_PASSWORD_SCHEME):
+    """
+    Etapa turmas→usuários. `existing_emails` é um dump da tabela users (SQL, CSV ou JSON)
+    cujos e-mails de aluno não podem ser gerados de novo; `turmas` é o TurmaIndex das turmas;
+    `password_scheme` define a senha inicial dos alunos (ver user_builder.PASSWORD_SCHEMES).
+    """
+    emails = EmailAllocator.from_dump(existing_emails) if existing_emails else None
+    return build_users(turmas_data, school_id, district_id, emails, turmas, password_scheme)
+
+
+def load_rows(path, **extract_options):
+    """
+    Retorna o documento de linhas de um PDF (executando a extração) ou de um arquivo gravado pela etapa pdf→linhas.
+    """
+    if path.lower().endswith('.pdf'):
+        return pdf_to_rows(path, **extract_options)
+    if path.lower().endswith('.csv'):
+        raise ValueError(f"{path} é um CSV da extração simples, que já traz os alunos por turma; use-o com rows-turmas sem --ndjson")
+
+    document = read_json(path)
+    if 'tables' not in document:
+        raise ValueError(f"{path} não é um arquivo de linhas (gerado pela etapa pdf-rows)")
+    return document
+
+
+def load_turmas(path, validate=True, **extract_options):
+    """
+    Retorna o JSON de turmas a partir de um PDF, de um arquivo de linhas, de um JSON de turmas
+    (no formato aninhado ou no formato do sync-service) ou de um CSV da antiga extração simples.
+    Só as etapas que faltam são executadas.
+    """
+    if path.lower().endswith('.csv'):
+        return nest_turmas(process_csv_to_json(path))
+    if path.lower().endswith('.pdf'):
+        return rows_to_turmas(load_rows(path, **extract_options), validate)
+
+    data = read_json(path)
+    if 'tables' in data:
+        return rows_to_turmas(data, validate)
+    if 'turmas' in data:
+        return data
+    return nest_turmas(data)
+
+
+def flatten_turmas(turmas_data):
+    """
+    Converte o JSON de turmas para o formato lido pelo sync-service (fetchSegesData):
+    {'metadados': {...}, nome_da_turma: [aluno, ...]}.
+    """
+    flat = {'metadados': turmas_data['metadados']}
+    flat.update(turmas_data['turmas'])
+    return flat
+
+
+def nest_turmas(flat_data):
+    """
+    Inverso de flatten_turmas.
+    """
+    flat_data = dict(flat_data)
+    metadata = flat_data.pop('metadados', {})
+    return {'metadados': metadata, 'turmas': flat_data}
+
+
+def default_output_path(input_path, suffix):
+    """
+    Caminho de saída padrão: ao lado do arquivo de entrada, com o sufixo da etapa
+    (ex: 'Alunos.pdf' -> 'Alunos.rows.json'). O sufixo '.rows' de um arquivo de linhas é removido.
+    """
+    stem = os.path.splitext(input_path)[0]
+    if stem.endswith('.rows'):
+        stem = stem[:-len('.rows')]
+    return stem + suffix
+
+
+def save_users(students, output_path, turmas=None, bulk=None, chunk_size=DEFAULT_CHUNK_SIZE, hash_jobs=None,
+               rounds=BCRYPT_ROUNDS, hash_json=False):
+    """
+    Grava os usuários gerados: o JSON do users-service ou, com bulk='csv'/'ndjson', os arquivos
+    de carga em lote na ordem das colunas da tabela users, com as senhas já com hash
+    (ver bulk_export.write_bulk_files). Com hash_json=True, o JSON também sai com as senhas com hash.
+    O bcrypt usa custo `rounds` e hash_jobs processos. As estatísticas por turma são gravadas nos dois casos.
+    """
+    from .user_builder import save_stats, save_to_json
+
+    if not bulk:
+        if hash_json:
+            from .password_hash import hash_user_passwords
+
+            hash_user_passwords(students, hash_jobs, rounds)
+        save_to_json(students, output_path, turmas)
+        return
+    from .bulk_export import write_bulk_files
+
+    write_bulk_files(students, output_path, bulk, chunk_size, hash_jobs, rounds)
+    save_stats(students, output_path, turmas)
+
+
+def convert_users_file(path, output_path=None, output_dir=None, school_id=None, district_id=None,
+                       existing_emails=None, validate=True, password_scheme=DEFAULT_PASSWORD_SCHEME,
+                       bulk=None, chunk_size=DEFAULT_CHUNK_SIZE, hash_jobs=None, rounds=BCRYPT_ROUNDS,
+                       hash_json=False, **extract_options):
+    """
+    Executa turmas→usuários para um arquivo e grava <entrada>_alunos.json (em output_dir, se informado),
+    ou os arquivos de carga em lote <entrada>_alunos.0001.csv, ... com bulk (ver save_users).
+    `password_scheme` define a senha inicial dos alunos (ver user_builder.PASSWORD_SCHEMES).
+    Usada tanto para um único arquivo quanto por arquivo em um lote (batch.run_batch).
+    """
+    turmas_data = load_turmas(path, validate, **extract_options)
+    turmas = TurmaIndex.from_turmas(turmas_data)
+    students = turmas_to_users(turmas_data, school_id, district_id, existing_emails, turmas, password_scheme)
+    if not students:
+        raise ValueError("não foi possível extrair dados de alunos")
+
+    if not output_path:
+        output_path = default_output_path(path, '_alunos.json')
+        if output_dir:
+            output_path = os.path.join(output_dir, os.path.basename(output_path))
+    save_users(students, output_path, turmas, bulk, chunk_size, hash_jobs, rounds, hash_json)
+    return {'alunos': len(students), 'saida': output_path}
+
+
+def school_slug(pdf_path):
+    """
+    Nome do PDF simplificado (sem acentos, minúsculo, palavras separadas por '-'), usado nos arquivos da escola.
+    O sufixo '.rows' de um arquivo de linhas e as marcas de cópia ("escola (2).pdf", "escola - Cópia.pdf")
+    são removidos, para o mesmo relatório baixado de novo continuar com o nome da exportação anterior
+    (ver snapshot_delta.find_previous_snapshot).
+    """
+    stem = os.path.splitext(os.path.basename(pdf_path))[0]
+    if stem.endswith('.rows'):
+        stem = stem[:-len('.rows')]
+    stem = COPY_SUFFIX_RE.sub('', stem)
+    return '-'.join(NON_SLUG_RE.sub(' ', ascii_text(stem).lower()).split())
+
+
+def sync_output_name(pdf_path, timestamp):
+    """
+    Nome do arquivo lido pelo sync-service (fetchSegesData procura dados_alunos_*.json):
+    dados_alunos_<AAAAMMDDHHMMSS>_<nome do PDF simplificado>.json, um por escola. O sync-service
+    escolhe o arquivo da escola sincronizada pelo metadados.escola, não só pelo mais recente.
+    """
+    return f"dados_alunos_{timestamp}_{school_slug(pdf_path)}.json"
+
+
+def delta_output_name(pdf_path, timestamp):
+    """
+    Nome do arquivo de diferenças gravado ao lado de cada exportação. Não começa com dados_alunos_,
+    então o fetchSegesData nunca o confunde com uma exportação completa.
+    """
+    return f"delta_alunos_{timestamp}_{school_slug(pdf_path)}.json"
+
+
+def duplicates_output_name(timestamp):
+    """
+    Nome do relatório de alunos repetidos de um lote (um por lote, não por escola).
+    """
+    return f"duplicados_alunos_{timestamp}.json"
+
+
+def write_json_atomic(data, output_path, indent=None):
+    """
+    Grava o JSON num arquivo temporário e o renomeia, para o sync-service nunca ler um arquivo pela metade.
+    """
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as output:
+        json.dump(data, output, ensure_ascii=False, indent=indent)
+    os.replace(tmp_path, output_path)
+
+
+def convert_school_file(path, output_dir, timestamp, validate=True, delta=True, **extract_options):
+    """
+    Executa pdf→linhas→turmas para o PDF de uma escola e grava o JSON no formato do sync-service.
+    Com delta=True, grava também delta_alunos_<data>_<escola>.json com as diferenças em relação à
+    exportação anterior da mesma escola na pasta (ver snapshot_delta.diff_snapshots).
+    Usada por arquivo no lote do comando `batch` (batch.run_batch).
+    """
+    document = load_rows(path, **extract_options)
+    turmas_data = rows_to_turmas(document, validate)
+    snapshot = flatten_turmas(turmas_data)
+
+    output_path = os.path.join(output_dir, sync_output_name(path, timestamp))
+    write_json_atomic(snapshot, output_path, indent=4)
+
+    counts = None
+    if delta:
+        counts = write_school_delta(snapshot, path, output_dir, timestamp, output_path)
+
+    return {
+        'alunos': sum(len(students) for students in turmas_data['turmas'].values()),
+        'turmas': len(turmas_data['turmas']),
+        'paginas': document.get('paginas', 0),
+        'saida': output_path,
+        'delta': counts,
+    }
+
+
+def write_school_delta(snapshot, pdf_path, output_dir, timestamp, output_path):
+    """
+    Compara a exportação recém-gravada com a anterior da escola e grava o arquivo de diferenças.
+    Retorna a quantidade de registros de cada tipo de mudança.
+    """
+    previous_path = find_previous_snapshot(output_dir, school_slug(pdf_path), exclude=output_path)
+    previous = read_json(previous_path) if previous_path else None
+    delta = diff_snapshots(previous, snapshot)
+    counts = delta_counts(delta)
+    metadata = {
+        'escola': snapshot['metadados'].get('escola'),
+        'exportacao': os.path.basename(output_path),
+        'anterior': os.path.basename(previous_path) if previous_path else None,
+        'contagem': counts,
+    }
+    write_json_atomic({'metadados': metadata, **delta}, os.path.join(output_dir, delta_output_name(pdf_path, timestamp)))
+    return counts
+
+
+def finish_school_files(results, output_dir, timestamp, policy=DEFAULT_DEDUPE_POLICY, delta=True):
+    """
+    Etapa final do comando `batch`, depois que todas as escolas foram convertidas (com delta=False):
+    procura os alunos repetidos entre turmas e escolas nas exportações gravadas (ver
+    duplicate_index.find_duplicates), aplica a política, regrava as exportações alteradas e grava o
+    relatório duplicados_alunos_<data>.json. Só então, com delta=True, grava o delta de cada escola,
+    que assim já não traz os registros removidos.
+    As exportações são ordenadas pela data do relatório no cabeçalho do PDF (metadados.data_relatorio)
+    e, com a mesma data ou sem ela, pela ordem na linha de comando; as sem data vêm antes das datadas.
+    A última é a que vale com keep-latest. Uma escola que fica sem nenhum aluno não tem a exportação
+    regravada: o arquivo é apagado, para o sync-service não sincronizar a escola vazia.
+    O resultado de cada escola recebe a contagem de alunos final e a do delta; retorna as contagens do
+    relatório e o caminho dele.
+    """
+    results = [result for result in results if not result['erro']]
+    snapshots = [read_json(result['saida']) for result in results]
+    order = sorted(range(len(results)),
+                   key=lambda index: (snapshots[index]['metadados'].get('data_relatorio') or '', index))
+    results = [results[index] for index in order]
+    snapshots = [snapshots[index] for index in order]
+    duplicates = find_duplicates(snapshots)
+    report = duplicates_report(snapshots, [os.path.basename(result['saida']) for result in results], duplicates, policy)
+
+    for source in apply_policy(snapshots, duplicates, policy):
+        results[source]['alunos'] = sum(len(students) for turma, students in snapshots[source].items()
+                                        if turma != 'metadados')
+        if results[source]['alunos']:
+            write_json_atomic(snapshots[source], results[source]['saida'], indent=4)
+        else:
+            os.remove(results[source]['saida'])
+            results[source]['saida'] = None
+
+    if delta:
+        for result, snapshot in zip(results, snapshots):
+            if result['saida'] is None:
+                continue
+            result['delta'] = write_school_delta(snapshot, result['arquivo'], output_dir, timestamp, result['saida'])
+
+    report_path = os.path.join(output_dir, duplicates_output_name(timestamp))
+    write_json_atomic(report, report_path, indent=2)
+    return {**report['metadados']['contagem'], 'politica': policy, 'saida': report_path}
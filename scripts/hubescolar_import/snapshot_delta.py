@@ -0,0 +1,124 @@
+import glob
+import os
+from typing import Dict, Iterable, Optional, Tuple
+
+from .email_allocator import normalize_text
+
+# Diferença entre dois arquivos dados_alunos_*.json de uma escola (formato do sync-service:
+# {'metadados': {...}, nome_da_turma: [aluno, ...]}). O sync noturno pode aplicar só os alunos
+# que entraram, saíram, mudaram de turma ou de telefone, em vez de comparar a escola inteira.
+
+
+def student_key(student: dict) -> str:
+    """
+    Chave estável de um aluno entre duas exportações: o ID INEP, quando o aluno tem um,
+    ou o nome normalizado (minúsculo, sem acentos e pontuação, com espaços simples) mais a data de nascimento.
+    """
+    id_inep = student.get('id_inep')
+    if id_inep:
+        return f"inep:{id_inep}"
+    return name_key(student)
+
+
+def name_key(student: dict) -> str:
+    """
+    Chave do aluno pelo nome normalizado (minúsculo, sem acentos e pontuação, com espaços simples)
+    e pela data de nascimento sem espaços.
+    """
+    dt_nascimento = ''.join((student.get('dt_nascimento') or '').split())
+    nome = ' '.join(normalize_text(student.get('nome', '')).split())
+    return f"nome:{nome}:{dt_nascimento}"
+
+
+def phone_digits(phones: Optional[Iterable[str]]) -> list:
+    """
+    Telefones só com os dígitos, ordenados: '(27) 99607-3648' e '(27)99607-3648' são o mesmo telefone.
+    """
+    return sorted(''.join(c for c in phone if c.isdigit()) for phone in phones or [])
+
+
+def iter_snapshot_students(snapshot: dict) -> Iterable[Tuple[str, dict]]:
+    """
+    Percorre (turma, aluno) de um arquivo no formato do sync-service.
+    """
+    for turma, students in snapshot.items():
+        if turma == 'metadados':
+            continue
+        for student in students:
+            yield turma, student
+
+
+def index_snapshot(snapshot: dict) -> Dict[str, Tuple[str, dict]]:
+    """
+    Índice chave do aluno -> (turma, aluno). Se a mesma chave aparecer duas vezes, vale a última.
+    """
+    return {student_key(student): (turma, student) for turma, student in iter_snapshot_students(snapshot)}
+
+
+def diff_snapshots(previous: Optional[dict], current: dict) -> dict:
+    """
+    Compara a exportação anterior com a atual, em tempo linear (dois índices da anterior: pela chave
+    do aluno e pelo nome e data).
+    Um aluno cuja chave não existe na anterior é procurado pelo nome e data (ver name_key), como em
+    duplicate_index.find_duplicates: quem ganhou o ID INEP entre as exportações (ou vem de uma exportação
+    de antes do ID INEP) passa de 'nome:...' para 'inep:...' e não deve aparecer como removido e adicionado.
+    Dois registros com ID INEP diferentes nunca são o mesmo aluno.
+    Sem exportação anterior, todos os alunos entram como adicionados.
+    Retorna {'adicionados', 'removidos', 'mudaram_turma', 'telefones_alterados'}, cada um uma lista
+    de registros com a chave do aluno.
+    """
+    before = index_snapshot(previous) if previous else {}
+    after = index_snapshot(current)
+    before_by_name = {name_key(student): key for key, (_, student) in before.items()}
+
+    delta = {'adicionados': [], 'removidos': [], 'mudaram_turma': [], 'telefones_alterados': []}
+    matched = set()
+    for key, (turma, student) in after.items():
+        old_key = key if key in before else name_match(before, before_by_name, after, matched, student)
+        if old_key is None:
+            delta['adicionados'].append({'chave': key, 'turma': turma, 'aluno': student})
+            continue
+        matched.add(old_key)
+        old_turma, old_student = before[old_key]
+        if old_turma != turma:
+            delta['mudaram_turma'].append({'chave': key, 'nome': student['nome'], 'de': old_turma, 'para': turma})
+        old_phones, phones = old_student.get('telefones') or [], student.get('telefones') or []
+        if phone_digits(old_phones) != phone_digits(phones):
+            delta['telefones_alterados'].append({'chave': key, 'nome': student['nome'], 'turma': turma,
+                                                 'antes': old_phones, 'depois': phones})
+    for key, (turma, student) in before.items():
+        if key not in matched:
+            delta['removidos'].append({'chave': key, 'nome': student['nome'], 'turma': turma})
+    return delta
+
+
+def name_match(before: Dict[str, Tuple[str, dict]], before_by_name: Dict[str, str], after: Dict[str, Tuple[str, dict]],
+               matched: set, student: dict) -> Optional[str]:
+    """
+    Chave, na exportação anterior, do registro com o mesmo nome e data do aluno, se ele ainda não
+    corresponder a nenhum aluno da atual (pela própria chave ou por outro aluno com o mesmo nome e data)
+    e se os dois não tiverem ID INEP diferentes.
+    """
+    old_key = before_by_name.get(name_key(student))
+    if old_key is None or old_key in after or old_key in matched:
+        return None
+    old_inep, id_inep = before[old_key][1].get('id_inep'), student.get('id_inep')
+    if old_inep and id_inep and old_inep != id_inep:
+        return None
+    return old_key
+
+
+def delta_counts(delta: dict) -> Dict[str, int]:
+    return {change: len(records) for change, records in delta.items()}
+
+
+def find_previous_snapshot(output_dir: str, slug: str, exclude: Optional[str] = None) -> Optional[str]:
+    """
+    Exportação mais recente da escola na pasta (dados_alunos_<AAAAMMDDHHMMSS>_<slug>.json):
+    o carimbo de data no nome ordena os arquivos, então não é preciso abrir nenhum.
+    """
+    pattern = os.path.join(glob.escape(output_dir), f"dados_alunos_*_{glob.escape(slug)}.json")
+    candidates = [path for path in glob.glob(pattern)
+                  if os.path.basename(path)[len('dados_alunos_'):].split('_', 1)[1] == f"{slug}.json"
+                  and (exclude is None or os.path.abspath(path) != os.path.abspath(exclude))]
+    return max(candidates, key=os.path.basename) if candidates else None
@@ -0,0 +1,61 @@
+import builtins
+import sys
+import time
+
+
+class ImportProfiler:
+    """
+    Mede o tempo de cada import feito enquanto está ativo (opção --profile-startup).
+
+    Substitui temporariamente builtins.__import__. Só os imports de nível mais externo de
+    módulos ainda não carregados são registrados, com o tempo total (incluindo os módulos que
+    eles importam): `import camelot` aparece uma vez, com o custo do OpenCV, pandas etc. embutido.
+    """
+
+    def __init__(self):
+        self.timings = []  # [(módulo, segundos), ...] na ordem em que foram importados
+        self.depth = 0
+        self.started_at = None
+        self.stopped_at = None
+        self.startup_cpu = None
+        self._original_import = None
+
+    def start(self):
+        # CPU gasta pelo processo até aqui: inicialização do Python, import da CLI e leitura dos argumentos
+        self.startup_cpu = time.process_time()
+        self.started_at = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+
+    def stop(self):
+        self.stopped_at = time.perf_counter()
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Imports relativos e de módulos já carregados são só consultas a sys.modules
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        self.depth += 1
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            self.depth -= 1
+            if self.depth == 0:
+                self.timings.append((name, time.perf_counter() - start))
+
+    def report(self, output):
+        """
+        Escreve a tabela de imports (do mais lento ao mais rápido) e os tempos totais.
+        """
+        total = (self.stopped_at or time.perf_counter()) - self.started_at
+        imports_total = sum(seconds for _, seconds in self.timings)
+        print("\n--- Perfil de inicialização ---", file=output)
+        print(f"{'iniciar o Python e carregar a CLI (CPU)':<40} {self.startup_cpu * 1000:9.1f} ms", file=output)
+        for name, seconds in sorted(self.timings, key=lambda timing: timing[1], reverse=True):
+            print(f"  import {name:<33} {seconds * 1000:9.1f} ms", file=output)
+        print(f"{'imports durante o comando':<40} {imports_total * 1000:9.1f} ms", file=output)
+        print(f"{'comando (incluindo imports)':<40} {total * 1000:9.1f} ms", file=output)
@@ -0,0 +1,20 @@
+from typing import Dict, List, Tuple
+
+# Índice dos alunos pelo ID INEP, gravado nos metadados do JSON de turmas ('indice_inep').
+# Quem consome o arquivo (sync-service, comparação entre exportações) encontra um aluno pelo ID
+# em tempo constante, sem comparar nome e data de nascimento com todos os alunos.
+
+
+def inep_index(turmas: Dict[str, List[dict]]) -> Dict[str, Tuple[str, int]]:
+    """
+    ID INEP -> (turma, posição do aluno na lista da turma, a partir de 0), para turmas no formato
+    {turma: [aluno, ...]}. Alunos sem ID INEP ficam de fora; se o mesmo ID aparecer mais de uma vez,
+    vale a primeira ocorrência.
+    """
+    index = {}
+    for turma, students in turmas.items():
+        for position, student in enumerate(students):
+            id_inep = student.get('id_inep')
+            if id_inep and id_inep not in index:
+                index[id_inep] = (turma, position)
+    return index
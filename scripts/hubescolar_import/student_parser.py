@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import json
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+from .models import Metadata, StudentRecord, validate_students, validate_turmas
+from .student_index import inep_index
+from .parsing import DATE_RE, LEADING_NUMBER_RE, find_turmas, split_leading_id
+from .text_cleaner import TextCleaner
+
+# Posição das colunas quando a tabela não tem linha de cabeçalho:
+# ID seguido do início do nome, resto do nome, data de nascimento, sexo, idade e telefones
+DEFAULT_COLUMNS = {'id': 0, 'nome': 1, 'dt_nascimento': 2, 'sexo': 3, 'idade': 4, 'telefones': 5}
+
+# Quantidade de alunos validados e escritos de uma vez no NDJSON
+NDJSON_BATCH_STUDENTS = 1000
+
+# Títulos do cabeçalho das tabelas do SEGES e o campo correspondente
+HEADER_FIELDS = {
+    'ID': 'id',
+    'ID INEP': 'id',
+    'INEP': 'inep',
+    'Nome': 'nome',
+    'Dt. Nascimento': 'dt_nascimento',
+    'Sexo': 'sexo',
+    'Idade': 'idade',
+    'Telefones': 'telefones',
+}
+
+# Os mesmos títulos sem espaços: o Camelot quebra títulos de colunas estreitas ("Dt. Nasciment o")
+COMPACT_HEADER_FIELDS = {title.replace(' ', ''): field for title, field in HEADER_FIELDS.items()}
+
+class StudentParser:
+    """
+    Etapa linhas→turmas: reconstrói os alunos a partir das linhas brutas das tabelas.
+    """
+
+    def __init__(self, validate: bool = True):
+        self.text_cleaner = TextCleaner()
+        # Valida os alunos com o Pydantic na saída; False para fontes confiáveis (ver models.validate_turmas)
+        self.validate = validate
+
+    def build_turmas(self, document: dict) -> dict:
+        """
+        Converte o documento de linhas (ver TableRowExtractor.extract_document) no JSON de turmas:
+        {'metadados': {...}, 'turmas': {nome_da_turma: [aluno, ...]}}, com as turmas na ordem do PDF.
+        Os metadados trazem o índice dos alunos pelo ID INEP (ver student_index.inep_index).
+        """
+        metadata = Metadata(**document['metadados']).model_dump(by_alias=True)
+        turma_name = document['turma']
+        tables = document['tables']
+
+        if not tables:
+            print("Nenhuma tabela detectada no PDF após a extração.")
+            # Retorna metadados mas sem turmas/alunos
+            return {'metadados': metadata, 'turmas': {turma_name: []}}
+
+        # 3. Processar tabelas: cada aluno chega com a turma do cabeçalho "Turma:" em vigor
+        all_students_by_turma = {}
+        for turma, student in self.iter_students(tables, turma_name):
+            all_students_by_turma.setdefault(turma, []).append(student)
+        if not all_students_by_turma:
+            all_students_by_turma[turma_name] = []
+        
+        # 4. Construir o JSON final (formato do PDFData), validando todos os alunos de uma vez
+        turmas = validate_turmas(all_students_by_turma, self.validate)
+        metadata['indice_inep'] = inep_index(turmas)
+        return {'metadados': metadata, 'turmas': turmas}
+
+    def write_ndjson(self, document: dict, output: TextIO) -> int:
+        """
+        Versão em streaming de build_turmas: escreve NDJSON em `output`, um objeto por linha.
+        A primeira linha traz os metadados ({"metadados": {...}}); cada linha seguinte é um aluno
+        com a chave "turma", escrita assim que o aluno é reconstruído.
+        Só um lote de até NDJSON_BATCH_STUDENTS alunos fica em memória, para ser validado de uma vez.
+        Retorna o número de alunos escritos.
+        """
+        output.write(json.dumps({'metadados': document['metadados']}, ensure_ascii=False) + '\n')
+
+        count = 0
+        batch = []
+        for turma, student in self.iter_students(document['tables'], document['turma']):
+            batch.append((turma, student))
+            if len(batch) >= NDJSON_BATCH_STUDENTS:
+                count += self.write_ndjson_batch(batch, output)
+                batch = []
+        return count + self.write_ndjson_batch(batch, output)
+
+    def write_ndjson_batch(self, batch: List[Tuple[str, StudentRecord]], output: TextIO) -> int:
+        """
+        Valida um lote de (turma, aluno) e escreve uma linha por aluno válido, na ordem do lote.
+        """
+        students = validate_students([student for _, student in batch], self.validate)
+        count = 0
+        for (turma, _), student in zip(batch, students):
+            if student is None:
+                continue
+            record = {'turma': turma}
+            record.update(student)
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+            count += 1
+        return count
+
+    def iter_students(self, tables: List[dict], turma_name: str) -> Iterator[Tuple[str, StudentRecord]]:
+        """
+        Gera (turma, StudentRecord) para cada aluno válido, à medida que cada um é reconstruído a partir das linhas das tabelas.
+        As tabelas são percorridas uma única vez, acompanhando a turma em vigor: ela muda em cada linha
+        "Turma: X" e no início de cada tabela com turma conhecida (ver table_turma). turma_name é a turma
+        usada até o primeiro cabeçalho.
+        Pipeline preguiçoso: tabelas -> linhas -> células limpas -> registros de alunos -> StudentRecord.
+        """
+        cleaned_rows = self.iter_cleaned_rows(self.iter_table_rows(tables))
+        for record_rows, columns, turma in self.iter_record_rows(cleaned_rows, turma=turma_name):
+            student = self.build_student(record_rows, columns)
+            if student is not None:
+                yield turma, student
+
+    def build_student(self, record_rows: List[List[str]], columns: Dict[str, int]) -> Optional[StudentRecord]:
+        """
+        Monta o StudentRecord de um registro com as funções célula a célula.
+        Retorna None (e registra o motivo) se o registro for inválido.
+        """
+        try:
+            student_data = self.reconstruct_student_data(record_rows, columns)
+            
+            # Processar os dados coletados
+            nome = student_data['nome']
+            dt_nascimento = student_data['dt_nascimento']
+            sexo = self.text_cleaner.normalize_sexo(student_data['sexo'])
+            idade = self.text_cleaner.normalize_idade(student_data['idade'])
+            telefone, telefones_list = self.text_cleaner.extract_and_clean_phones(student_data['telefones_raw'])
+            id_inep = self.text_cleaner.normalize_id_inep(student_data['id_inep'])
+        except Exception as e:
+            print(f"Erro ao processar linha e reconstruir dados do aluno: {record_rows[0]} - Erro: {e}")
+            return None
+
+        return self.create_student(nome, dt_nascimento, sexo, idade, telefone, telefones_list, id_inep)
+
+    def create_student(self, nome: str, dt_nascimento: str, sexo: str, idade: int,
+                       telefone: Optional[str], telefones: List[str], id_inep: Optional[str] = None) -> Optional[StudentRecord]:
+        """
+        Cria o StudentRecord se o registro tiver nome e data de nascimento; caso contrário retorna None.
+        A validação do Pydantic fica para a saída, com todos os alunos de uma vez (ver models.validate_students).
+        """
+        # Adicionar apenas se tiver nome válido
+        if not (nome.strip() and dt_nascimento.strip()): # Adicionar validação de data também
+            print(f"Linha ignorada (nome ou data de nascimento inválidos): {nome!r} {dt_nascimento!r}")
+            return None
+        return StudentRecord(nome, dt_nascimento, sexo, idade, telefone, telefones, id_inep)
+
+    def table_turma(self, table: dict) -> Optional[str]:
+        """
+        Turma em vigor a partir do início da tabela: a que a etapa pdf→linhas encontrou pela posição
+        dos cabeçalhos (table['turma']). Tabelas sem essa informação (tabula, arquivos de linhas antigos)
+        ou que trazem a própria linha "Turma:" retornam None; nelas a turma muda exatamente nessa linha.
+        """
+        label = table.get('turma')
+        if not label:
+            return None
+        if any('Turma:' in str(cell) for row in table['rows'] for cell in row):
+            return None
+        return label
+
+    def header_turma(self, row: list) -> Optional[str]:
+        """
+        Nome da turma de uma linha "Turma: X", ou None.
+        O nome vai até o fim da célula com "Turma:" (ver parsing.TURMA_LABEL_RE), sem o texto das células seguintes.
+        """
+        for cell in row:
+            turmas = find_turmas(str(cell), labeled_only=True)
+            if turmas:
+                return turmas[0][1]
+        return None
+
+    def detect_columns(self, cleaned_row: List[str]) -> Optional[Dict[str, int]]:
+        """
+        Se a linha for o cabeçalho da tabela (ID, INEP, Nome, ...), retorna {campo: índice da coluna}.
+        """
+        columns = {}
+        for index, cell in enumerate(cleaned_row):
+            field = HEADER_FIELDS.get(cell) or COMPACT_HEADER_FIELDS.get(cell.replace(' ', ''))
+            if field and field not in columns:
+                columns[field] = index
+        if 'id' in columns and 'nome' in columns:
+            return columns
+        return None
+
+    def iter_table_rows(self, tables: List[dict]) -> Iterator[Tuple[Optional[str], list]]:
+        """
+        Gera as linhas de todas as tabelas em sequência, sem copiá-las para uma lista única.
+        Um aluno que começa no fim de uma tabela pode continuar na seguinte.
+        Gera (turma, linha): a primeira linha de cada tabela leva a turma da tabela (ver table_turma), as demais None.
+        """
+        for table in tables:
+            label = self.table_turma(table)
+            for row in table['rows']:
+                yield label, row
+                label = None
+
+    def iter_cleaned_rows(self, rows: Iterator[Tuple[Optional[str], list]]) -> Iterator[Tuple[Optional[str], List[str]]]:
+        """
+        Limpa cada célula uma única vez (ver TextCleaner.clean_cell_text).
+        """
+        clean = self.text_cleaner.clean_cell_text
+        for label, row in rows:
+            yield label, [clean(cell) for cell in row]
+
+    def iter_record_rows(self, cleaned_rows: Iterator[Tuple[Optional[str], List[str]]],
+                         columns: Dict[str, int] = DEFAULT_COLUMNS,
+                         turma: Optional[str] = None) -> Iterator[Tuple[List[List[str]], Dict[str, int], Optional[str]]]:
+        """
+        Agrupa as linhas de cada aluno: a linha inicial (coluna de ID começa com o número)
+        seguida das linhas de continuação, até a próxima linha com ID.
+        Linhas de cabeçalho atualizam a posição das colunas; elas e as linhas com "Turma:" encerram o aluno atual.
+        A turma em vigor muda nas linhas "Turma: X" e na primeira linha de uma tabela de outra turma,
+        que também encerra o aluno atual.
+        Só as linhas do aluno atual ficam em memória; o grupo é emitido quando a próxima linha com ID aparece.
+        Gera (linhas_do_aluno, posição_das_colunas, turma).
+        """
+        record_rows = None
+        for label, row in cleaned_rows:
+            if label and label != turma:
+                if record_rows:
+                    yield record_rows, columns, turma
+                record_rows = None
+                turma = label
+
+            header_columns = self.detect_columns(row)
+            is_turma = any('Turma:' in cell for cell in row)
+            if header_columns or is_turma:
+                if record_rows:
+                    yield record_rows, columns, turma
+                record_rows = None
+                columns = header_columns or columns
+                if is_turma:
+                    turma = self.header_turma(row) or turma
+                continue
+
+            id_index = columns['id']
+            if id_index < len(row) and LEADING_NUMBER_RE.match(row[id_index]):
+                # Esta linha parece ser o início de dados de um aluno (começa com ID numérico)
+                if record_rows:
+                    yield record_rows, columns, turma
+                record_rows = [row]
+            elif record_rows is not None:
+                record_rows.append(row)
+            else:
+                # Não é o início de dados de um aluno nem continuação de um
+                print(f"Linha ignorada (não inicia com ID numérico): {row}")
+        if record_rows:
+            yield record_rows, columns, turma
+
+    def reconstruct_student_data(self, record_rows: List[List[str]], columns: Dict[str, int] = DEFAULT_COLUMNS) -> dict:
+        """
+        Reconstruir dados de um aluno que podem estar fragmentados em múltiplas linhas.
+        Recebe as linhas já limpas do aluno (a linha inicial seguida das continuações) e a posição das colunas,
+        e retorna um dicionário com os dados do aluno.
+        """
+        def cell(row: List[str], field: str) -> str:
+            index = columns.get(field)
+            return row[index] if index is not None and index < len(row) else ''
+
+        student_data = {
+            'nome': '',
+            'dt_nascimento': '',
+            'sexo': '',
+            'idade': '',
+            'telefones_raw': '',
+            'id_inep': ''
+        }
+        
+        name_parts = []
+        
+        # Processa a primeira linha que inicia o registro do aluno
+        first_row = record_rows[0]
+        
+        # Tenta extrair o ID e o início do nome
+        id_match = split_leading_id(cell(first_row, 'id'))
+        
+        if id_match:
+            name_parts.append(id_match[1])
+        
+        # ID INEP (coluna própria, com o número às vezes quebrado: "1238374589 88"; validado em build_student)
+        student_data['id_inep'] = cell(first_row, 'inep')
+        
+        # Coleta partes do nome da coluna de nome, se existir e não estiver vazia
+        if cell(first_row, 'nome'):
+            name_parts.append(cell(first_row, 'nome'))
+        
+        # Data de Nascimento (unindo as partes de uma data quebrada na coluna estreita: "14/08/200 7")
+        dt_nascimento = cell(first_row, 'dt_nascimento').replace(' ', '')
+        if DATE_RE.match(dt_nascimento):
+            student_data['dt_nascimento'] = dt_nascimento
+        
+        # Sexo
+        if cell(first_row, 'sexo') in ['M', 'F']:
+            student_data['sexo'] = cell(first_row, 'sexo')
+        
+        # Idade
+        if LEADING_NUMBER_RE.match(cell(first_row, 'idade')):
+            student_data['idade'] = cell(first_row, 'idade')
+        
+        # Telefones (primeira parte)
+        student_data['telefones_raw'] = cell(first_row, 'telefones')
+        
+        # Linhas adicionais com o resto do nome ou outros dados (nenhuma começa com ID)
+        for additional_row in record_rows[1:]:
+            # Tentar pegar continuação do nome das colunas de ID e de nome da linha adicional
+            if cell(additional_row, 'id'):
+                name_parts.append(cell(additional_row, 'id'))
+            
+            if cell(additional_row, 'nome'):
+                name_parts.append(cell(additional_row, 'nome'))
+            
+            # Juntar telefones de linhas subsequentes
+            if cell(additional_row, 'telefones'):
+                if student_data['telefones_raw']:
+                    student_data['telefones_raw'] += ' ' + cell(additional_row, 'telefones')
+                else:
+                    student_data['telefones_raw'] = cell(additional_row, 'telefones')
+        
+        # Reconstruir o nome completo
+        student_data['nome'] = ' '.join(filter(None, name_parts)).strip() # Use filter(None, ...) para remover strings vazias.
+        
+        return student_data
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+from .parsing import WHITESPACE_RE, find_phones, normalize_inep
+
+class TextCleaner:
+    def clean_cell_text(self, text: str) -> str:
+        """
+        Limpa o texto de uma célula da tabela.
+        Remove aspas extras, espaços múltiplos, quebras de linha que podem vir da extração.
+        """
+        if text is None:
+            return ""
+        text = str(text).strip()
+        text = text.replace('"', '').strip() # Remove aspas
+        text = WHITESPACE_RE.sub(' ', text) # Substitui múltiplos espaços por um único espaço
+        text = text.replace('\n', ' ') # Substitui quebras de linha por espaço
+        return text
+
+    def normalize_sexo(self, sexo_raw: str) -> str:
+        """
+        Converte 'M' para 'masculino' e 'F' para 'feminino'.
+        """
+        sexo_raw = self.clean_cell_text(sexo_raw).upper()
+        if sexo_raw == 'M':
+            return 'masculino'
+        elif sexo_raw == 'F':
+            return 'feminino'
+        return 'indefinido' # Ou levantar um erro
+
+    def normalize_idade(self, idade_raw: str) -> int:
+        """
+        Remove " anos" e converte a idade para inteiro.
+        """
+        idade_str = self.clean_cell_text(idade_raw).replace('anos', '').strip()
+        try:
+            return int(idade_str)
+        except ValueError:
+            return 0 # Ou levantar um erro
+
+    def normalize_id_inep(self, inep_raw: str) -> Optional[str]:
+        """
+        Junta as partes do ID INEP quebrado na coluna estreita e confere os 12 dígitos.
+        Célula vazia (aluno sem INEP) ou inválida retorna None; a inválida é registrada.
+        """
+        id_inep = normalize_inep(inep_raw)
+        if id_inep is None and inep_raw.strip():
+            print(f"ID INEP inválido ignorado: {inep_raw!r}")
+        return id_inep
+
+    def extract_and_clean_phones(self, phones_raw: str) -> Tuple[Optional[str], List[str]]:
+        """
+        Extrai todos os telefones de uma string e retorna o primeiro e a lista completa.
+        Espera telefones no formato (DD) DDDDD-DDDD ou (DD) DDDD-DDDD.
+        """
+        clean_phones_raw = self.clean_cell_text(phones_raw)
+        # Telefones no formato (DD) DDDDD-DDDD ou (DD) DDDD-DDDD, com ou sem espaço após o DDD,
+        # devolvidos sem espaços: (DD)DDDDD-DDDD ou (DD)DDDD-DDDD
+        cleaned_phones = [f"({ddd}){first}-{second}" for ddd, first, second in find_phones(clean_phones_raw)]
+
+        first_phone = cleaned_phones[0] if cleaned_phones else None
+        return first_phone, cleaned_phones
@@ -0,0 +1,209 @@
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from .parsing import DATE_RE, LEADING_NUMBER_RE
+from .pdf_document import PDFDocument, PDFSource, open_document
+from .pdf_extractor import MIN_RULING_LINES
+
+# Extração das tabelas pela camada de texto do PDF (engine 'text').
+# Os PDFs do SEGES são gerados por sistema: cada palavra tem posição exata e a grade da tabela
+# é desenhada com linhas vetoriais. As células são remontadas a partir das linhas da grade e das
+# coordenadas das palavras (PyMuPDF), sem rasterizar a página como o Camelot lattice.
+
+# Títulos das colunas (sem espaços, para aceitar "Dt. Nasciment o" quebrado em linhas) e o campo correspondente
+TEXT_HEADER_FIELDS = [
+    ('ID', 'id'),
+    ('INEP', 'inep'),
+    ('Nome', 'nome'),
+    ('Dt.', 'dt_nascimento'),
+    ('Sexo', 'sexo'),
+    ('Idade', 'idade'),
+    ('Telefones', 'telefones'),
+]
+
+# Campos sem os quais a página não é considerada legível
+REQUIRED_FIELDS = {'id', 'nome', 'dt_nascimento', 'sexo', 'idade', 'telefones'}
+
+# Título emitido na linha de cabeçalho de cada tabela (os mesmos do student_parser.HEADER_FIELDS)
+HEADER_LABELS = {
+    'id': 'ID',
+    'inep': 'INEP',
+    'nome': 'Nome',
+    'dt_nascimento': 'Dt. Nascimento',
+    'sexo': 'Sexo',
+    'idade': 'Idade',
+    'telefones': 'Telefones',
+}
+
+# Campos em colunas estreitas, onde números e datas quebram no meio ("14/08/200\n7"): as linhas são unidas sem espaço
+UNBROKEN_FIELDS = {'id', 'inep', 'dt_nascimento'}
+
+# Distância máxima (pt) entre linhas da grade consideradas a mesma linha
+RULE_TOLERANCE = 1.0
+
+
+def _merge_positions(positions: List[float]) -> List[float]:
+    """
+    Ordena as posições e junta as que estão a menos de RULE_TOLERANCE umas das outras.
+    """
+    merged = []
+    for position in sorted(positions):
+        if not merged or position - merged[-1] > RULE_TOLERANCE:
+            merged.append(position)
+    return merged
+
+
+def _header_field(text: str) -> Optional[str]:
+    compact = ''.join(text.split())
+    for title, field in TEXT_HEADER_FIELDS:
+        if compact == title or (title.endswith('.') and compact.startswith(title)):
+            return field
+    return None
+
+
+def _cell_text(words: List[tuple]) -> str:
+    """
+    Texto de uma célula: palavras da mesma linha separadas por espaço e linhas por '\\n', como no Camelot.
+    """
+    lines = []
+    last_top = None
+    for word in sorted(words, key=lambda word: (round(word[1]), word[0])):
+        if last_top is None or word[1] - last_top > 2:
+            lines.append([])
+            last_top = word[1]
+        lines[-1].append(word[4])
+    return '\n'.join(' '.join(line) for line in lines)
+
+
+class TextLayerExtractor:
+    """
+    Lê as tabelas de alunos a partir das palavras posicionadas e das linhas da grade de cada página.
+
+    As páginas são lidas em seções: uma página com a linha de títulos (ID, INEP, Nome, ...) e as
+    páginas seguintes sem títulos, que continuam a mesma tabela. Se qualquer página de uma seção
+    não puder ser lida com segurança, a seção inteira volta para o Camelot, porque as páginas de
+    continuação dependem das colunas detectadas na página de títulos.
+    """
+
+    def read_grid(self, drawings: list) -> Tuple[List[float], List[float]]:
+        """
+        Posições das linhas verticais (x) e horizontais (y, com origem no topo) da grade, a partir
+        dos desenhos da página (PDFDocument.drawings).
+        """
+        vertical, horizontal = [], []
+        for path in drawings:
+            for item in path['items']:
+                if item[0] == 'l':
+                    start, end = item[1], item[2]
+                    if abs(start.x - end.x) < RULE_TOLERANCE:
+                        vertical.append(start.x)
+                    elif abs(start.y - end.y) < RULE_TOLERANCE:
+                        horizontal.append(start.y)
+                elif item[0] == 're':
+                    rect = item[1]
+                    if rect.width < 2 <= rect.height:
+                        vertical.append(rect.x0)
+                    elif rect.height < 2 <= rect.width:
+                        horizontal.append(rect.y0)
+        return _merge_positions(vertical), _merge_positions(horizontal)
+
+    def read_page(self, document: PDFDocument, page_number: int,
+                  fields: Optional[List[Optional[str]]]) -> Tuple[Optional[dict], Optional[List[Optional[str]]], bool]:
+        """
+        Lê a tabela de uma página (1-based). `fields` são os campos das colunas da página de títulos anterior.
+        Retorna (tabela ou None, campos das colunas em vigor, se a página tem linha de títulos).
+        A tabela é None quando a página não pode ser lida com segurança.
+        """
+        # A última página de uma turma pode ter uma única linha de aluno (duas linhas horizontais)
+        columns_x, rows_y = self.read_grid(document.drawings(page_number))
+        if len(columns_x) < MIN_RULING_LINES or len(rows_y) < 2:
+            return None, fields, False
+
+        # Cada palavra vai para a célula (faixa entre duas linhas horizontais, coluna entre duas verticais)
+        # que contém o seu centro; palavras fora da grade (cabeçalho do relatório, "Turma:") ficam de fora
+        cells: Dict[Tuple[int, int], List[tuple]] = {}
+        for word in document.words(page_number):
+            x, y = (word[0] + word[2]) / 2, (word[1] + word[3]) / 2
+            column, band = bisect_right(columns_x, x) - 1, bisect_right(rows_y, y) - 1
+            if 0 <= column < len(columns_x) - 1 and 0 <= band < len(rows_y) - 1:
+                cells.setdefault((band, column), []).append(word)
+
+        n_columns = len(columns_x) - 1
+        bands = sorted({band for band, _ in cells})
+        rows = [[_cell_text(cells.get((band, column), [])) for column in range(n_columns)] for band in bands]
+
+        # Linha de títulos: a primeira linha com ID e Nome
+        header_index = None
+        for index, row in enumerate(rows):
+            row_fields = [_header_field(cell) for cell in row]
+            if 'id' in row_fields and 'nome' in row_fields:
+                header_index, fields = index, row_fields
+                break
+        has_header = header_index is not None
+        if not fields or len(fields) != n_columns or not REQUIRED_FIELDS <= set(fields):
+            return None, fields if has_header else None, has_header
+
+        # Linhas acima dos títulos (cabeçalho do relatório e título da turma dentro da grade) não são de alunos
+        data_rows = rows[header_index + 1:] if has_header else rows
+        unbroken = [column for column, field in enumerate(fields) if field in UNBROKEN_FIELDS]
+        for row in data_rows:
+            for column in unbroken:
+                row[column] = row[column].replace('\n', '')
+        if not self.rows_look_valid(data_rows, fields):
+            return None, fields, has_header
+
+        # Toda tabela começa com a linha de títulos, inclusive nas páginas de continuação
+        header = [HEADER_LABELS.get(field, '') for field in fields]
+        first_band = bands[header_index] if has_header else bands[0] if bands else 0
+        top, bottom = rows_y[first_band], rows_y[-1]
+        height = document.page(page_number).rect.height
+        table = {
+            'page': page_number,
+            'bbox': [round(columns_x[0], 2), round(height - bottom, 2), round(columns_x[-1], 2), round(height - top, 2)],
+            'rows': [header] + data_rows,
+        }
+        return table, fields, has_header
+
+    def rows_look_valid(self, rows: List[List[str]], fields: List[Optional[str]]) -> bool:
+        """
+        Confere se as colunas caíram no lugar certo: em cada linha de aluno o ID é numérico,
+        a data está vazia ou no formato DD/MM/AAAA, o sexo é M/F (ou vazio) e a idade começa com número.
+        """
+        index = {field: column for column, field in enumerate(fields) if field}
+        for row in rows:
+            student_id = row[index['id']]
+            if not student_id:
+                continue
+            if not student_id.isdigit():
+                return False
+            date, sex, age = row[index['dt_nascimento']], row[index['sexo']], row[index['idade']]
+            if date and not DATE_RE.fullmatch(date):
+                return False
+            if sex not in ('', 'M', 'F'):
+                return False
+            if age and not LEADING_NUMBER_RE.match(age):
+                return False
+        return True
+
+    def extract_tables(self, pdf: PDFSource) -> Tuple[List[dict], List[int]]:
+        """
+        Lê todas as páginas em uma passada.
+        Retorna as tabelas lidas pela camada de texto ([{'page', 'bbox', 'rows'}, ...], a primeira linha
+        de cada uma com os títulos das colunas) e as páginas que devem ser extraídas com o Camelot.
+        """
+        sections = []  # [[(página, tabela ou None), ...], ...]
+        fields = None
+        with open_document(pdf) as document:
+            for page_number in document.page_numbers():
+                table, fields, has_header = self.read_page(document, page_number, fields)
+                if has_header or not sections:
+                    sections.append([])
+                sections[-1].append((page_number, table))
+
+        tables, fallback_pages = [], []
+        for section in sections:
+            if all(table is not None for _, table in section):
+                tables.extend(table for _, table in section)
+            else:
+                fallback_pages.extend(page_number for page_number, _ in section)
+        return tables, fallback_pages
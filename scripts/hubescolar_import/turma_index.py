@@ -0,0 +1,103 @@
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from .parsing import TURMA_PARTS_RE
+
+# Dados de cada turma derivados do código do SEGES (ex: 1ªIV01-EM), calculados uma vez por execução.
+
+# Horário do users-service (ENUM 'Manhã', 'Tarde', 'Noite', 'Integral') pela primeira letra do turno:
+# I/IV integral, M matutino, V vespertino, N noturno
+SHIFT_SCHEDULES = {
+    'I': 'Integral',
+    'M': 'Manhã',
+    'V': 'Tarde',
+    'T': 'Tarde',
+    'N': 'Noite',
+}
+DEFAULT_SCHEDULE = 'Integral'
+
+
+@dataclass(frozen=True)
+class TurmaInfo:
+    """
+    Partes do código de uma turma. Turmas fora do padrão (ex: nomes digitados no cabeçalho)
+    ficam só com o nome e o horário padrão.
+    """
+    nome: str
+    serie: Optional[int] = None
+    turno: Optional[str] = None
+    sequencia: Optional[int] = None
+    nivel: Optional[str] = None
+    horario: str = DEFAULT_SCHEDULE
+
+
+def parse_turma(name: str) -> TurmaInfo:
+    """
+    Separa o código da turma em série, turno, sequência e nível e determina o horário pelo turno.
+    """
+    match = TURMA_PARTS_RE.match(name.strip().upper()) if isinstance(name, str) else None
+    if not match:
+        return TurmaInfo(nome=name)
+    turno = match.group('turno')
+    return TurmaInfo(
+        nome=name,
+        serie=int(match.group('serie')),
+        turno=turno,
+        sequencia=int(match.group('sequencia')),
+        nivel=match.group('nivel'),
+        horario=SHIFT_SCHEDULES.get(turno[0], DEFAULT_SCHEDULE),
+    )
+
+
+class TurmaIndex:
+    """
+    Índice nome da turma -> TurmaInfo, montado uma vez com todas as turmas encontradas.
+    Os alunos de uma turma usam o mesmo TurmaInfo em vez de recalcular o horário, e a contagem
+    de alunos por turma é feita aqui, sem reler os usuários gerados.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.turmas: Dict[str, TurmaInfo] = {}
+        self.counts: Counter = Counter()
+        for name in names:
+            self.get(name)
+
+    @classmethod
+    def from_turmas(cls, turmas_data) -> 'TurmaIndex':
+        """
+        Índice das turmas do JSON de turmas ({'metadados': ..., 'turmas': {turma: [aluno, ...]}}).
+        """
+        return cls(turmas_data['turmas'])
+
+    def get(self, name: str) -> TurmaInfo:
+        info = self.turmas.get(name)
+        if info is None:
+            info = self.turmas[name] = parse_turma(name)
+        return info
+
+    __getitem__ = get
+
+    def __len__(self):
+        return len(self.turmas)
+
+    def __iter__(self):
+        return iter(self.turmas.values())
+
+    def count(self, name: str, students: int = 1):
+        self.counts[name] += students
+
+    def group_by(self, field: str) -> Dict[object, List[TurmaInfo]]:
+        """
+        Turmas agrupadas por um dos campos de TurmaInfo (ex: 'horario', 'serie', 'nivel').
+        """
+        groups: Dict[object, List[TurmaInfo]] = {}
+        for info in self.turmas.values():
+            groups.setdefault(getattr(info, field), []).append(info)
+        return groups
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Alunos por turma, na ordem das turmas (só as turmas com alunos).
+        """
+        return {name: self.counts[name] for name in self.turmas if self.counts[name]}
@@ -0,0 +1,167 @@
+import json
+
+from .email_allocator import EmailAllocator
+from .parsing import find_date, find_phones
+from .turma_index import TurmaIndex
+
+# Etapa turmas→usuários: gera os registros de alunos no formato do modelo User do users-service.
+
+DEFAULT_PASSWORD = "trocarSenh@"
+
+# Senha inicial de cada aluno gerado:
+#   padrao      DEFAULT_PASSWORD para todos
+#   nascimento  a data de nascimento do aluno, DDMMAAAA (alunos sem data ficam com DEFAULT_PASSWORD)
+PASSWORD_SCHEMES = ('padrao', 'nascimento')
+DEFAULT_PASSWORD_SCHEME = 'padrao'
+
+# Função para extrair telefone
+def extract_phones(phone_text):
+    if not isinstance(phone_text, str):
+        return []
+    
+    phones = []
+    for match in find_phones(phone_text):
+        ddd, part1, part2 = match
+        formatted_phone = f"55{ddd}{part1}{part2}"
+        phones.append(formatted_phone)
+    
+    return phones
+
+# Função para extrair data de nascimento
+def extract_birthdate(date_text):
+    if not isinstance(date_text, str):
+        return None
+    
+    match = find_date(date_text)
+    
+    if match:
+        day, month, year = match
+        return f"{year}-{month}-{day}"
+    
+    return None
+
+# Função para gerar a senha inicial do aluno (birthdate_str no formato AAAA-MM-DD, de extract_birthdate)
+def initial_password(birthdate_str, scheme=DEFAULT_PASSWORD_SCHEME):
+    if scheme == 'nascimento' and birthdate_str:
+        year, month, day = birthdate_str.split('-')
+        return f"{day}{month}{year}"
+    return DEFAULT_PASSWORD
+
+# Função para converter o gênero do formato do PDF para o formato do modelo
+def convert_gender(gender_code):
+    # Aceita o código do PDF (M/F) e o sexo já normalizado pela etapa de turmas (masculino/feminino)
+    gender_map = {
+        'M': 'Masculino',
+        'F': 'Feminino'
+    }
+    if not isinstance(gender_code, str):
+        return None
+    return gender_map.get(gender_code.strip()[:1].upper(), None)
+
+# Função para gerar os alunos de todas as turmas
+def build_users(turmas_data, school_id, district_id, emails=None, turmas=None, password_scheme=DEFAULT_PASSWORD_SCHEME):
+    """
+    Converte o JSON de turmas ({'metadados': ..., 'turmas': {turma: [aluno, ...]}}) na lista de
+    usuários do users-service, na ordem das turmas.
+    `emails` é o EmailAllocator a usar (ex: EmailAllocator.from_dump com os usuários já cadastrados);
+    `turmas` é o TurmaIndex que recebe a contagem de alunos por turma (usado por save_to_json);
+    `password_scheme` define a senha inicial de cada aluno (ver PASSWORD_SCHEMES).
+    """
+    all_students = []
+    if emails is None:
+        emails = EmailAllocator()
+    if turmas is None:
+        turmas = TurmaIndex()
+    
+    for class_name, class_students in turmas_data['turmas'].items():
+        turma = turmas.get(class_name)
+        students = process_class(turma, class_students, school_id, district_id, emails, password_scheme)
+        turmas.count(class_name, len(students))
+        all_students.extend(students)
+    
+    print(f"Total de alunos processados: {len(all_students)}")
+    return all_students
+
+# Função para processar os alunos de uma turma
+def process_class(turma, class_students, school_id, district_id, emails, password_scheme=DEFAULT_PASSWORD_SCHEME):
+    # turma é o TurmaInfo compartilhado por todos os alunos da turma
+    class_name = turma.nome
+    print(f"Processando turma: {class_name}")
+    students = []
+    
+    schedule = turma.horario
+    print(f"Horário determinado para a turma {class_name}: {schedule}")
+    
+    for aluno in class_students:
+        try:
+            name = str(aluno.get('nome', '')).strip().upper()
+            if not name:
+                continue
+            
+            # Extrair e converter valores para o formato correto
+            birthdate_str = extract_birthdate(aluno.get('dt_nascimento'))
+            gender = convert_gender(aluno.get('sexo'))
+            
+            # Processar telefones - usar o primeiro número se houver múltiplos
+            phones = [phone for raw_phone in aluno.get('telefones') or [] for phone in extract_phones(raw_phone)]
+            primary_phone = phones[0] if phones else None
+            
+            # Gerar email único
+            email = emails.allocate(name)
+            
+            # Criar objeto do estudante conforme modelo User.js
+            student = {
+                # Apenas campos que existem no modelo
+                "name": name.title(),
+                "email": email,
+                "password": initial_password(birthdate_str, password_scheme),
+                "role": "Aluno",
+                "status": "active",
+                "schoolId": school_id,
+                "districtId": district_id,
+                "phone": primary_phone,
+                "dateOfBirth": birthdate_str,
+                "gender": gender,
+                "horario": schedule,
+                "content": f"Turma: {class_name}",
+                # Chave estável do aluno entre importações (None se o relatório não trouxer o INEP)
+                "idInep": aluno.get('id_inep'),
+            }
+            
+            students.append(student)
+            
+        except Exception as e:
+            print(f"Erro ao processar aluno: {e}")
+            continue
+    
+    print(f"Alunos processados na turma {class_name}: {len(students)}")
+    return students
+
+# Função para salvar em JSON
+def save_to_json(students, output_file, turmas=None):
+    try:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(students, f, ensure_ascii=False, indent=2)
+        print(f"Dados salvos em {output_file}")
+        save_stats(students, output_file, turmas)
+        
+    except Exception as e:
+        print(f"Erro ao salvar arquivo JSON: {e}")
+
+# Função para salvar as estatísticas por turma ao lado do arquivo de alunos (<saida>_stats.json)
+def save_stats(students, output_file, turmas=None):
+    # Estatísticas já contadas no TurmaIndex, se informado
+    if turmas is not None:
+        class_stats = turmas.stats()
+    else:
+        class_stats = {}
+        for student in students:
+            turma = student.get('content', '').replace('Turma: ', '')
+            if turma not in class_stats:
+                class_stats[turma] = 0
+            class_stats[turma] += 1
+    
+    stats_file = output_file.replace('.json', '_stats.json')
+    with open(stats_file, 'w', encoding='utf-8') as f:
+        json.dump(class_stats, f, ensure_ascii=False, indent=2)
+    print(f"Estatísticas por turma salvas em {stats_file}")
@@ -0,0 +1,56 @@
+"""
+Conferência da extração do relatório de exemplo (scripts/Alunos por turma - EEEFM JOAO CRISOSTOMO BELESA.pdf):
+a engine 'text' contra o JSON versionado e o Camelot contra a engine 'text'.
+Usa as funções de benchmarks/text_layer_parity.py, sem cache de extração.
+
+Uso: python -m pytest scripts/tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(0, os.path.join(SCRIPTS_DIR, 'benchmarks'))
+
+import text_layer_parity as parity  # noqa: E402
+
+# Páginas usadas na comparação com o Camelot (lento): a primeira turma e o início da segunda,
+# onde o Camelot junta a coluna Telefones na linha "Turma:" (ver pdf_extractor.split_spanning_cells)
+CAMELOT_PAGES = 6
+
+
+def write_pages(pdf_path, page_count, output_path):
+    """Grava um PDF só com as primeiras páginas."""
+    import fitz  # PyMuPDF
+
+    with fitz.open(pdf_path) as source:
+        source.select(range(page_count))
+        source.save(output_path)
+
+
+class ExtractionParityTest(unittest.TestCase):
+    def test_text_engine_matches_reference_json(self):
+        import json
+
+        with open(parity.DEFAULT_JSON, 'r', encoding='utf-8') as file:
+            reference = json.load(file)
+        turmas, _ = parity.extract_turmas(parity.DEFAULT_PDF, 'text')
+        differences, _ = parity.compare(reference, turmas)
+        self.assertEqual(parity.unexpected(differences), [])
+
+    def test_camelot_matches_text_engine(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            pdf_path = os.path.join(workdir, 'inicio.pdf')
+            write_pages(parity.DEFAULT_PDF, CAMELOT_PAGES, pdf_path)
+            text_turmas, _ = parity.extract_turmas(pdf_path, 'text')
+            camelot_turmas, _ = parity.extract_turmas(pdf_path, 'camelot')
+        self.assertGreater(sum(len(students) for students in text_turmas.values()), 0)
+        differences, moved = parity.compare(text_turmas, camelot_turmas)
+        self.assertEqual(differences, [])
+        self.assertEqual(moved, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,6 +18,15 @@ const {
     formatarGenero
 } = require('./syncHelpers');
 
+/**
+ * Nome de escola para comparação: sem acentos, minúsculo e com espaços simples
+ * @param {string} nome - Nome da escola
+ * @returns {string} Nome normalizado ('' se vazio)
+ */
+function normalizarNomeEscola(nome) {
+    return nome ? normalizarNome(nome).replace(/\s+/g, ' ') : '';
+}
+
 class SyncService {
     constructor() {
         // URLs dos serviços baseados nas variáveis de ambiente
@@ -49,7 +58,7 @@ class SyncService {
             });
             
             // 3. Obter dados do SEGES
-            const segesData = await this.fetchSegesData(token);
+            const segesData = await this.fetchSegesData(token, schoolId);
             
             // 4. Obter lista de turmas existentes na escola
             const existingClasses = await this.fetchExistingClasses(token, schoolId);
@@ -127,7 +136,7 @@ class SyncService {
             const { districtId } = userData;
             
             // 2. Obter dados do SEGES
-            const segesData = await this.fetchSegesData(token);
+            const segesData = await this.fetchSegesData(token, schoolId);
             
             // 3. Obter lista de turmas existentes na escola
             const existingClasses = await this.fetchExistingClasses(token, schoolId);
@@ -214,7 +223,7 @@ class SyncService {
                 
                 try {
                     // Buscar dados do SEGES (que também verifica arquivos locais)
-                    const segesData = await this.fetchSegesData(token);
+                    const segesData = await this.fetchSegesData(token, schoolId);
                     
                     // Verificar se há turmas no arquivo local
                     const turmasNomes = Object.keys(segesData).filter(key => key !== "metadados");
@@ -330,7 +339,7 @@ class SyncService {
                 
                 try {
                     // Buscar dados do SEGES para os alunos
-                    const segesData = await this.fetchSegesData(token);
+                    const segesData = await this.fetchSegesData(token, schoolId);
                     
                     // Processar alunos com as turmas existentes
                     const alunosProcessados = await this.processarAlunosSEGES(
@@ -475,56 +484,15 @@ class SyncService {
     /**
      * Busca dados de turmas e alunos do SEGES ou dos arquivos locais
      * @param {string} token - Token JWT
+     * @param {number} schoolId - ID da escola cujos dados devem ser usados
      * @returns {Object} Dados do SEGES ou arquivos locais
      */
-    async fetchSegesData(token) {
+    async fetchSegesData(token, schoolId) {
         try {
-            // 1. Primeiro, verificar se existem arquivos JSON recentes na pasta data
-            const fs = require('fs');
-            const path = require('path');
-            const dataDir = path.join(__dirname, '../../data');
-            
-            // Verificar se o diretório existe
-            if (fs.existsSync(dataDir)) {
-                // Obter todos os arquivos na pasta data
-                const files = fs.readdirSync(dataDir);
-                
-                // Filtrar apenas arquivos JSON que começam com dados_alunos_
-                const jsonFiles = files.filter(file => 
-                    file.endsWith('.json') && file.startsWith('dados_alunos_')
-                );
-                
-                if (jsonFiles.length > 0) {
-                    // Ordenar por data de modificação (mais recente primeiro)
-                    const sortedFiles = jsonFiles.sort((a, b) => {
-                        const statA = fs.statSync(path.join(dataDir, a));
-                        const statB = fs.statSync(path.join(dataDir, b));
-                        return statB.mtime.getTime() - statA.mtime.getTime();
-                    });
-                    
-                    // Obter o arquivo mais recente
-                    const newestFile = sortedFiles[0];
-                    const filePath = path.join(dataDir, newestFile);
-                    
-                    // Verificar a data de modificação
-                    const fileStats = fs.statSync(filePath);
-                    const fileAge = Date.now() - fileStats.mtime.getTime();
-                    const oneDayInMs = 24 * 60 * 60 * 1000;
-                    
-                    // Se o arquivo tiver menos de 1 dia, usá-lo
-                    if (fileAge < oneDayInMs) {
-                        logger.info(`Usando arquivo JSON local recente: ${newestFile}`);
-                        const jsonData = JSON.parse(fs.readFileSync(filePath, 'utf8'));
-                        
-                        // Logs para debug da estrutura dos dados
-                        const turmasNomes = Object.keys(jsonData).filter(key => key !== "metadados");
-                        logger.debug(`Arquivo contém ${turmasNomes.length} turmas: ${turmasNomes.join(', ')}`);
-                        
-                        return jsonData;
-                    }
-                    
-                    logger.info(`Arquivo mais recente (${newestFile}) tem mais de 1 dia, buscando no SEGES`);
-                }
+            // 1. Primeiro, verificar se existe um arquivo JSON recente da escola na pasta data
+            const localData = await this.lerArquivoLocalEscola(token, schoolId);
+            if (localData) {
+                return localData;
             }
             
             // 2. Se não houver arquivos recentes, tentar obter do SEGES
@@ -557,6 +525,93 @@ class SyncService {
         }
     }
 
+    /**
+     * Lê o arquivo dados_alunos_*.json mais recente (menos de 1 dia) da escola na pasta data.
+     * O comando `batch` do hubescolar_import grava um arquivo por escola no mesmo lote, então o
+     * arquivo é escolhido pelo nome da escola (metadados.escola) e não só pela data de modificação.
+     * Se o nome da escola não puder ser obtido, só usa o arquivo mais recente quando todos os
+     * arquivos recentes forem da mesma escola.
+     * @param {string} token - Token JWT
+     * @param {number} schoolId - ID da escola
+     * @returns {Object|null} Dados do arquivo, ou null se não houver arquivo recente da escola
+     */
+    async lerArquivoLocalEscola(token, schoolId) {
+        const fs = require('fs');
+        const path = require('path');
+        const dataDir = path.join(__dirname, '../../data');
+        
+        // Verificar se o diretório existe
+        if (!fs.existsSync(dataDir)) {
+            return null;
+        }
+        
+        // Filtrar apenas arquivos JSON que começam com dados_alunos_, com menos de 1 dia
+        const oneDayInMs = 24 * 60 * 60 * 1000;
+        const recentFiles = fs.readdirSync(dataDir)
+            .filter(file => file.endsWith('.json') && file.startsWith('dados_alunos_'))
+            .map(file => ({ file, mtime: fs.statSync(path.join(dataDir, file)).mtime.getTime() }))
+            .filter(({ mtime }) => Date.now() - mtime < oneDayInMs)
+            // Mais recente primeiro; no mesmo lote (mesma data), pelo nome do arquivo
+            .sort((a, b) => b.mtime - a.mtime || b.file.localeCompare(a.file));
+        
+        if (recentFiles.length === 0) {
+            logger.info('Nenhum arquivo JSON local com menos de 1 dia, buscando no SEGES');
+            return null;
+        }
+        
+        const arquivos = recentFiles.map(({ file }) => ({
+            file,
+            data: JSON.parse(fs.readFileSync(path.join(dataDir, file), 'utf8'))
+        }));
+        const nomeEscola = await this.buscarNomeEscola(token, schoolId);
+        const escolaDoArquivo = ({ data }) => normalizarNomeEscola((data.metadados || {}).escola);
+        
+        let escolhido;
+        if (nomeEscola) {
+            escolhido = arquivos.find(arquivo => escolaDoArquivo(arquivo) === nomeEscola);
+            if (!escolhido) {
+                logger.info(`Nenhum arquivo JSON local recente da escola ${schoolId}, buscando no SEGES`);
+                return null;
+            }
+        } else if (new Set(arquivos.map(escolaDoArquivo)).size === 1) {
+            escolhido = arquivos[0];
+        } else {
+            logger.warn(`Arquivos JSON locais de várias escolas e nome da escola ${schoolId} indisponível, buscando no SEGES`);
+            return null;
+        }
+        
+        logger.info(`Usando arquivo JSON local recente: ${escolhido.file}`);
+        
+        // Logs para debug da estrutura dos dados
+        const turmasNomes = Object.keys(escolhido.data).filter(key => key !== "metadados");
+        logger.debug(`Arquivo contém ${turmasNomes.length} turmas: ${turmasNomes.join(', ')}`);
+        
+        return escolhido.data;
+    }
+
+    /**
+     * Busca o nome da escola no school-service, normalizado para comparar com metadados.escola
+     * @param {string} token - Token JWT
+     * @param {number} schoolId - ID da escola
+     * @returns {string|null} Nome normalizado, ou null se não for possível obtê-lo
+     */
+    async buscarNomeEscola(token, schoolId) {
+        if (!schoolId) {
+            return null;
+        }
+        try {
+            const response = await axios.get(`${this.schoolServiceUrl}/schools/${schoolId}`, {
+                headers: {
+                    'Authorization': `Bearer ${token}`
+                }
+            });
+            return normalizarNomeEscola(response.data && response.data.name);
+        } catch (error) {
+            logger.warn(`Não foi possível obter o nome da escola ${schoolId}: ${error.message}`);
+            return null;
+        }
+    }
+
     /**
      * Busca turmas existentes na escola
      * @param {string} token - Token JWT